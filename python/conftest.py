@@ -0,0 +1,3 @@
+"""
+Makes the packages of the tool (core, ui) importable by the tests, like Maya does with its script path.
+"""
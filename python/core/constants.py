@@ -10,3 +10,8 @@ MFN_CONSTRAINT_TYPES_TO_NAME_TYPES = {maya.api.OpenMaya.MFn.kParentConstraint: "
 BASE_TRANSFORM_AXES = ('x',
                        'y',
                        'z')
+CONSTRAINT_NODE_TYPES = tuple(MFN_CONSTRAINT_TYPES_TO_NAME_TYPES.values())
+
+# Output attributes of the constraint nodes per kind of transformation.
+CONSTRAINT_TRANSLATE_OUTPUT = 'constraintTranslate'
+CONSTRAINT_ROTATE_OUTPUT = 'constraintRotate'
@@ -1,12 +1,180 @@
+import collections
+
 import mbMayaApi
+import maya.api.OpenMaya
 import maya.cmds
 
+import core.propConstraintHandover
+import core.propConstraintValidator
+import core.rigMetadataCache
+
 MAIN_POSITION_CTRL = 'Main_position_ctrl'
 OBJECT_NOT_ACCEPTED = ('camera')
 DESIRED_CONTROL_ATTRIBUTE = 'ParentAttr'
 
+ControlRecord = collections.namedtuple('ControlRecord', ['namespace',
+                                                         'fullName',
+                                                         'name',
+                                                         'value'])
+
+
+def iterSpaceSwitchCtrlsFromScene(inNamespaceList):
+    """
+    Get the space switch controls of the namespaces in a single read-only pass over the DG.
+
+    Args:
+        inNamespaceList(list[str]), namespaces to get the controls from, with or without ':'.
+
+    Yield:
+        ControlRecord, control found, as soon as the iteration reaches it.
+    """
+
+    namespaceSet = set(namespace.strip(':') for namespace in inNamespaceList)
+    if not namespaceSet:
+        return
+
+    nodeIterator = maya.api.OpenMaya.MItDependencyNodes(maya.api.OpenMaya.MFn.kTransform)
+    dependencyNodeFn = maya.api.OpenMaya.MFnDependencyNode()
+
+    while not nodeIterator.isDone():
+        nodeObject = nodeIterator.thisNode()
+        nodeIterator.next()
+
+        dependencyNodeFn.setObject(nodeObject)
+        namespace, _, controlName = dependencyNodeFn.name().rpartition(':')
+
+        if namespace not in namespaceSet or not dependencyNodeFn.hasAttribute(DESIRED_CONTROL_ATTRIBUTE):
+            continue
+
+        # Control with namespace, the path is only added when the name is not unique.
+        controlFullName = maya.api.OpenMaya.MDagPath.getAPathTo(nodeObject).partialPathName()
+
+        # Out Value of the control.
+        controlValue = getPlugValueAsString(dependencyNodeFn.findPlug(DESIRED_CONTROL_ATTRIBUTE, False))
+
+        yield ControlRecord(namespace, controlFullName, controlName, controlValue)
+
+
+def getSpaceSwitchCtrlsFromNames(inNamespace, inControlNameList):
+    """
+    Get the space switch controls of a namespace from their names, reading their ParentAttr value from the scene.
+
+    Args:
+        inNamespace(str), namespace of the controls, without ':'.
+        inControlNameList(list[str]), controls without namespace.
+
+    Returns:
+        list[ControlRecord], controls found, None if one of them is missing, not unique or without ParentAttr.
+    """
+
+    selectionList = maya.api.OpenMaya.MSelectionList()
+
+    try:
+        for controlName in inControlNameList:
+            selectionList.add('{0}:{1}'.format(inNamespace, controlName))
+
+    # The rig in the scene does not match the names
+    except RuntimeError:
+        return None
+
+    if selectionList.length() != len(inControlNameList):
+        return None
+
+    dependencyNodeFn = maya.api.OpenMaya.MFnDependencyNode()
+    controlRecordList = []
+
+    for index, controlName in enumerate(inControlNameList):
+        dependencyNodeFn.setObject(selectionList.getDependNode(index))
+        if not dependencyNodeFn.hasAttribute(DESIRED_CONTROL_ATTRIBUTE):
+            return None
+
+        # Out Value of the control, always read from the scene.
+        controlValue = getPlugValueAsString(dependencyNodeFn.findPlug(DESIRED_CONTROL_ATTRIBUTE, False))
+
+        controlRecordList.append(ControlRecord(inNamespace,
+                                               '{0}:{1}'.format(inNamespace, controlName),
+                                               controlName,
+                                               controlValue))
+
+    return controlRecordList
+
+
+def getPlugValueAsString(inPlug):
+    """
+    Get the value of a string or enum plug as string.
+
+    Args:
+        inPlug(MPlug), plug to read.
+
+    Returns:
+        str, value of the plug, the name of the field for enum attributes.
+    """
+
+    plugAttribute = inPlug.attribute()
+    if plugAttribute.hasFn(maya.api.OpenMaya.MFn.kEnumAttribute):
+        return maya.api.OpenMaya.MFnEnumAttribute(plugAttribute).fieldName(inPlug.asShort())
+
+    return inPlug.asString()
+
+
+def iterSpaceSwitchTargets(inControlRecords, inCharacterNamespaceList, inNodeExists=maya.cmds.objExists):
+    """
+    Get the character target controls of the space switch controls, as they are discovered.
+
+    Args:
+        inControlRecords(iterable[ControlRecord]), space switch controls of the props.
+        inCharacterNamespaceList(list[str]), name spaces to get the target controls from.
+        inNodeExists(callable), returns True if the given node exists, the scene is queried by default.
+
+    Yield:
+        tuple(ControlRecord, str, list[str]), control, character namespace and its target controls.
+    """
+
+    for controlRecord in inControlRecords:
+        for objectNameSpace in inCharacterNamespaceList:
+
+            # Add the namespace to controls of the destination
+            destinationControl = '{0}{1}'.format(objectNameSpace, controlRecord.name)
+            childControl = '{0}{1}'.format(objectNameSpace, controlRecord.value)
+
+            targetList = [destinationControl, childControl]
+
+            if not inNodeExists(destinationControl):
+                targetList.remove(destinationControl)
+
+            elif not inNodeExists(childControl):
+                targetList.remove(childControl)
+
+            yield controlRecord, objectNameSpace, targetList
+
+
+def deleteConstraintsOfCtrls(inControlNameList):
+    """
+    Delete the constraints of the controls in a single call.
+
+    Args:
+        inControlNameList(iterable[str]), controls with namespace.
+    """
+
+    constraintToDelete = []
+    for controlName in inControlNameList:
+        for constraint in mbMayaApi.MBTransform(mbMayaApi.MBNode(controlName)).getConstraints():
+            constraintToDelete.append(constraint.name)
+
+    if constraintToDelete:
+        maya.cmds.delete(constraintToDelete)
+
 
 class PropConstraint(object):
+    """
+    Core of the OnPropConstraint Tool.
+
+    Args:
+        inMetadataClient (RigMetadataCacheClient): Client of the rig metadata daemon shared by the sessions.
+    """
+
+    def __init__(self, inMetadataClient=None):
+        self.metadataClient = inMetadataClient or core.rigMetadataCache.RigMetadataCacheClient()
 
     def getReferencesFromScene(self):
         """
@@ -51,81 +219,186 @@ class PropConstraint(object):
             selectedItemsList.append(node.namespace)
         return selectedItemsList
 
-
     @staticmethod
-    def getSpaceSwitchCtrlsByNamespace(inPropNamespaceList,
-                                      inCharacterNamespaceList):
+    def getRigFilePathDict():
         """
-        Get the space switch controls of the prop from namespace.
+        Get the file path of the rigs referenced in the scene, with a single pass over the references.
+
+        Returns:
+            dict, {namespace without ':': path of the rig file} of the loaded references.
+        """
+
+        rigFilePathDict = {}
+
+        for referenceName in maya.cmds.ls(type="reference") or []:
+            try:
+                namespace = maya.cmds.referenceQuery(referenceName, namespace=True).strip(':')
+                rigFilePathDict.setdefault(namespace, maya.cmds.referenceQuery(referenceName,
+                                                                               filename=True,
+                                                                               withoutCopyNumber=True))
+
+            # when reference is not loaded or is not linked to a file, we get runtime error
+            except RuntimeError:
+                continue
+
+        return rigFilePathDict
+
+    def storeRigMetadata(self, inRigKey, inControlNameList):
+        """
+        Store the metadata of the rig gathered from the scene in the daemon shared by the Maya sessions.
 
         Args:
-            inPropNamespaceList(list), name spaces to get the character controls from.
-            inCharacterNamespaceList(list), name spaces to get the target controls from.
+            inRigKey(str), key of the rig, see core.rigMetadataCache.getRigFileKey().
+            inControlNameList(list[str]), space switch controls of the rig, without namespace.
 
         Returns:
-            dict, {propName with namespace:[character target controls with namespace]}
+            dict, the stored metadata.
+        """
 
+        rigMetadata = core.rigMetadataCache.getRigMetadata(inControlNameList)
+
+        self.metadataClient.setMetadata(inRigKey, rigMetadata)
+
+        return rigMetadata
+
+    def iterSpaceSwitchCtrls(self, inNamespaceList):
         """
+        Get the space switch controls of the namespaces, from the metadata daemon or the scene.
 
-        controlData = {}
+        The daemon only gives the names of the controls of a rig, their ParentAttr value is always read from
+        the scene. The namespaces not cached by the daemon are read in a single pass over the DG, and the
+        namespaces without controls are skipped.
 
-        for targetNamespace in inPropNamespaceList:
-            nodesInSceneByNameSpace = list(mbMayaApi.MBNode().getNodesByNamespace(targetNamespace))
+        Args:
+            inNamespaceList(list[str]), namespaces to get the controls from, with or without ':'.
+
+        Yield:
+            ControlRecord, control found.
+        """
 
-            if not nodesInSceneByNameSpace:
-                return
+        # The references are only queried when the daemon can be reached.
+        rigFilePathDict = {}
+        if self.metadataClient.connect():
+            rigFilePathDict = self.getRigFilePathDict()
 
-            for mbNode in nodesInSceneByNameSpace:
-                if not mbNode.hasAttribute(DESIRED_CONTROL_ATTRIBUTE):
-                    continue
+        uncachedRigKeyDict = collections.OrderedDict()
+        visitedNamespaceSet = set()
+
+        for namespace in inNamespaceList:
+            namespace = namespace.strip(':')
+            if namespace in visitedNamespaceSet:
+                continue
+            visitedNamespaceSet.add(namespace)
+
+            rigKey = core.rigMetadataCache.getRigFileKey(rigFilePathDict.get(namespace))
+            controlNameList = core.rigMetadataCache.getControlNames(self.metadataClient.getMetadata(rigKey))
+
+            controlRecordList = None
+            if controlNameList is not None:
+                controlRecordList = getSpaceSwitchCtrlsFromNames(namespace, controlNameList)
+
+            if controlRecordList is None:
+                uncachedRigKeyDict[namespace] = rigKey
+                continue
 
-                constraintToDelete = []
-                connectedConstraintList = list(mbMayaApi.MBTransform(mbNode).getConstraints())
-                if connectedConstraintList:
-                    for constraint in connectedConstraintList:
-                        constraintToDelete.append(constraint.name)
-                    maya.cmds.delete(constraintToDelete)
+            for controlRecord in controlRecordList:
+                yield controlRecord
 
-                # Control with namespace.
-                controlFullName = mbNode.fullName
+        controlNameListByNamespace = collections.defaultdict(list)
+        ambiguousNamespaceSet = set()
 
-                # Control without namespace.
-                controlName = mbNode.name
+        for controlRecord in iterSpaceSwitchCtrlsFromScene(uncachedRigKeyDict):
+            controlNameListByNamespace[controlRecord.namespace].append(controlRecord.name)
 
-                # Out Value of the control.
-                controlValue = mbNode[DESIRED_CONTROL_ATTRIBUTE].value
+            # The cached controls are named namespace:control, the rigs with non unique names are not cached.
+            if controlRecord.fullName != '{0}:{1}'.format(controlRecord.namespace, controlRecord.name):
+                ambiguousNamespaceSet.add(controlRecord.namespace)
 
-                for objectNameSpace in inCharacterNamespaceList:
+            yield controlRecord
 
-                    # Add the namespace to controls of the destination
-                    destinationControl = '{0}{1}'.format(objectNameSpace, controlName)
-                    childControl = '{0}{1}'.format(objectNameSpace, controlValue)
+        for namespace, rigKey in uncachedRigKeyDict.items():
+            if rigKey and namespace not in ambiguousNamespaceSet:
+                self.storeRigMetadata(rigKey, controlNameListByNamespace[namespace])
 
-                    targetList = [destinationControl, childControl]
+    def getSpaceSwitchCtrlsByNamespace(self,
+                                       inPropNamespaceList,
+                                       inCharacterNamespaceList):
+        """
+        Get the space switch controls of the prop from namespace.
 
-                    if not maya.cmds.objExists(destinationControl):
-                        targetList.remove(destinationControl)
+        Args:
+            inPropNamespaceList(list), name spaces to get the character controls from.
+            inCharacterNamespaceList(list), name spaces to get the target controls from.
 
-                    elif not maya.cmds.objExists(childControl):
-                        targetList.remove(childControl)
+        Returns:
+            dict, {propName with namespace:[character target controls with namespace]}
 
-                    controlData.setdefault(controlFullName, targetList)
+        """
+
+        controlData = {}
+
+        for controlRecord, _, targetList in iterSpaceSwitchTargets(self.iterSpaceSwitchCtrls(inPropNamespaceList),
+                                                                   inCharacterNamespaceList):
+            controlData.setdefault(controlRecord.fullName, targetList)
+
+        # The scene is only modified once the discovery is done.
+        deleteConstraintsOfCtrls(controlData)
 
         return controlData
 
-    @staticmethod
-    def setSpaceSwitchDefaultPosition(inSpaceSwitchDataDict):
+    def validateScene(self, inPropNamespaceList, inCharacterNamespaceList):
+        """
+        Check every node needed by the selection before the scene is modified.
+
+        Args:
+            inPropNamespaceList(list[str]), namespaces of the props.
+            inCharacterNamespaceList(list[str]), namespaces of the characters.
+
+        Returns:
+            ValidationResult, controls of the props with their targets.
+
+        Raises:
+            PropConstraintValidationError, with all the issues found if the selection can not be applied.
+        """
+
+        validationResult = core.propConstraintValidator.PropConstraintValidator(self).validateScene(
+                                                                                    inPropNamespaceList,
+                                                                                    inCharacterNamespaceList)
+
+        if not validationResult.isValid:
+            raise core.propConstraintValidator.PropConstraintValidationError(validationResult.issueList)
+
+        return validationResult
+
+    def setSpaceSwitchDefaultPosition(self, inSpaceSwitchDataDict):
 
         """
         Set the spaceSwitch of the prop(s) controls in the default position to pose it.
 
         Args:
             inSpaceSwitchDataDict(dict), SpaceSwitch controls from the prop and the character control.
+
+        Raises:
+            PropConstraintValidationError, before any control is moved if the selection can not be applied.
         """
 
         if not inSpaceSwitchDataDict:
             return
 
+        propNamespaceList = []
+        characterNamespaceList = []
+        for propCtrl, targetList in inSpaceSwitchDataDict.items():
+            propNamespace = mbMayaApi.MBNode(propCtrl).namespace
+            if propNamespace not in propNamespaceList:
+                propNamespaceList.append(propNamespace)
+
+            characterNamespace = '{0}:'.format(mbMayaApi.MBNode(targetList[0]).namespace)
+            if characterNamespace not in characterNamespaceList:
+                characterNamespaceList.append(characterNamespace)
+
+        # Check the whole selection before the first prop is moved.
+        self.validateScene(propNamespaceList, characterNamespaceList)
+
         for propCtrl in inSpaceSwitchDataDict:
 
             # Get the Global control of the "prop"
@@ -137,13 +410,6 @@ class PropConstraint(object):
                                             mbMayaApi.MBNode(inSpaceSwitchDataDict[propCtrl][0]).namespace,
                                             MAIN_POSITION_CTRL)
 
-            if not maya.cmds.objExists(propElementPositionCtrl) or not maya.cmds.objExists(characterElementPositionCtrl):
-
-                print 'No Found {0} or {1}, the setting of controls can not be applied'.format(
-                                                                        propElementPositionCtrl,
-                                                                        characterElementPositionCtrl)
-                return
-
             characterTranslateMatrix = maya.cmds.xform(characterElementPositionCtrl,
                                                        query=True,
                                                        worldSpace=True,
@@ -164,15 +430,86 @@ class PropConstraint(object):
                                                         propCtrl,
                                                         maintainOffset=0))
 
+    @staticmethod
+    def setSpaceSwitchHandover(inPropCtrl, inHandoverEventList):
+        """
+        Key the handover of the prop control between the characters along the animation.
+
+        Args:
+            inPropCtrl(str), prop control with namespace to hand over.
+            inHandoverEventList(list[tuple(float, str)]), frame and character namespace the prop goes to.
+
+        Returns:
+            str, name of the created parent constraint, None if there is not any event.
+
+        Raises:
+            PropConstraintValidationError, with all the issues found if the handover can not be applied.
+        """
+
+        if not inHandoverEventList:
+            return
+
+        mbNode = mbMayaApi.MBNode(inPropCtrl)
+        if not mbNode.hasAttribute(DESIRED_CONTROL_ATTRIBUTE):
+            raise core.propConstraintValidator.PropConstraintValidationError([
+                            core.propConstraintValidator.ValidationIssue(
+                                            core.propConstraintValidator.ISSUE_NO_CONTROLS,
+                                            inPropCtrl,
+                                            '{0} has no {1}'.format(inPropCtrl, DESIRED_CONTROL_ATTRIBUTE))])
+
+        # Control without namespace.
+        controlName = mbNode.name
+
+        # Out Value of the control.
+        controlValue = mbNode[DESIRED_CONTROL_ATTRIBUTE].value
+
+        eventControlList = []
+        for frame, objectNameSpace in inHandoverEventList:
 
+            # Add the namespace to controls of the destination
+            destinationControl = '{0}{1}'.format(objectNameSpace, controlName)
+            childControl = '{0}{1}'.format(objectNameSpace, controlValue)
 
+            eventControlList.append((frame, destinationControl, childControl))
+
+        # Single query for the targets of all the events.
+        existingNodeSet = set(maya.cmds.ls([control
+                                            for _, destinationControl, childControl in eventControlList
+                                            for control in (destinationControl, childControl)]) or [])
+
+        eventTargetList = []
+        issueList = []
+        for frame, destinationControl, childControl in eventControlList:
+
+            if destinationControl in existingNodeSet:
+                eventTargetList.append((frame, destinationControl))
+
+            elif childControl in existingNodeSet:
+                eventTargetList.append((frame, childControl))
+
+            else:
+                issueList.append(core.propConstraintValidator.ValidationIssue(
+                                            core.propConstraintValidator.ISSUE_MISSING_TARGET,
+                                            inPropCtrl,
+                                            'No Found {0} or {1}, target of {2} at frame {3}'.format(
+                                                                                        destinationControl,
+                                                                                        childControl,
+                                                                                        inPropCtrl,
+                                                                                        frame)))
+
+        # Nothing is keyed unless every event has a target.
+        if issueList:
+            raise core.propConstraintValidator.PropConstraintValidationError(issueList)
+
+        return core.propConstraintHandover.createHandover(inPropCtrl, eventTargetList)
 
     def createConstraints(self,
                           inTargetNamespaceList,
                           inObjectNamespaceList,
                           inMFnTypeConstraint,
                           translateSkipAxes,
-                          rotateSkipAxes):
+                          rotateSkipAxes,
+                          inSpaceSwitchPlanList=None):
         """
         Create the constraint of the OnPropConstraint Tool.
 
@@ -182,55 +519,27 @@ class PropConstraint(object):
             inMFnTypeConstraint (int), MFn constraint type.
             translateSkipAxes (list[str]), translate axes to skipped in the constraint.
             rotateSkipAxes (list[str]), rotate axes to skipped in the constraint.
+            inSpaceSwitchPlanList (list[tuple]), controls and targets already validated, see
+                                                 core.propConstraintValidator, validated here if None.
         Returns:
             None.
-        """
-
-        for targetNamespace in inTargetNamespaceList:
-            nodesInSceneByNameSpace = list(mbMayaApi.MBScene().getNodesByNamespace(targetNamespace))
 
-            if not nodesInSceneByNameSpace:
-                return
-
-            for mbNode in nodesInSceneByNameSpace:
-                if not mbNode.hasAttribute(DESIRED_CONTROL_ATTRIBUTE):
-                    continue
-
-                constraintToDelete = []
-                connectedConstraintList = list(mbMayaApi.MBTransform(mbNode).getConstraints())
-                if connectedConstraintList:
-                    for constraint in connectedConstraintList:
-                        constraintToDelete.append(constraint.name)
-                    maya.cmds.delete(constraintToDelete)
-
-                # Control without namespace.
-                controlName = mbNode.name
-
-                # Out Value of the control.
-                controlValue = mbNode[DESIRED_CONTROL_ATTRIBUTE].value
-
-                # Get the Main/Global Control of the character
-                propElementPositionCtrl = '{0}:{1}'.format(mbNode.namespace, MAIN_POSITION_CTRL)
-                if not maya.cmds.objExists(propElementPositionCtrl):
-                    print 'Can Find The ' + MAIN_POSITION_CTRL
-
-                for objectNameSpace in inObjectNamespaceList:
-
-                    # Add the namespace to controls of the destination
-                    destinationControl = '{0}{1}'.format(objectNameSpace, controlName)
-                    childControl = '{0}{1}'.format(objectNameSpace, controlValue)
+        Raises:
+            PropConstraintValidationError, before any constraint is deleted if the selection can not be applied.
+        """
 
-                    targetList = [destinationControl, childControl]
+        spaceSwitchPlanList = inSpaceSwitchPlanList
+        if spaceSwitchPlanList is None:
+            spaceSwitchPlanList = self.validateScene(inTargetNamespaceList, inObjectNamespaceList).spaceSwitchPlanList
 
-                    if not maya.cmds.objExists(destinationControl):
-                        targetList.remove(destinationControl)
+        # The scene is only modified once the discovery is done.
+        deleteConstraintsOfCtrls(set(controlRecord.fullName for controlRecord, _, _ in spaceSwitchPlanList))
 
-                    elif not maya.cmds.objExists(childControl):
-                        targetList.remove(childControl)
+        for controlRecord, objectNameSpace, targetList in spaceSwitchPlanList:
 
-                    onTargetsList = [mbMayaApi.MBNode(target) for target in targetList]
+            # Get the Main/Global Control of the character, checked by the validation.
+            propElementPositionCtrl = '{0}:{1}'.format(controlRecord.namespace, MAIN_POSITION_CTRL)
 
-                    objectElementPositionCtrl = '{0}:{1}'.format(objectNameSpace, MAIN_POSITION_CTRL)
+            onTargetsList = [mbMayaApi.MBNode(target) for target in targetList]
 
-                    if not maya.cmds.objExists(objectElementPositionCtrl):
-                        print 'Can Find The ' + MAIN_POSITION_CTRL
+            objectElementPositionCtrl = '{0}:{1}'.format(objectNameSpace, MAIN_POSITION_CTRL)
@@ -0,0 +1,190 @@
+"""
+Module created to key the handover of a prop control between several targets along the animation.
+
+The compensating offsets of every switch are computed from cached world matrices and each attribute of the
+constraint is keyed with a single bulk call, so the prop keeps its world position on every switch.
+"""
+import json
+import os
+
+import maya.api.OpenMaya
+import maya.cmds
+
+import core.constants
+import core.propConstraintKeysCommand
+
+OFFSET_TRANSLATE_ATTRIBUTE = 'targetOffsetTranslate'
+OFFSET_ROTATE_ATTRIBUTE = 'targetOffsetRotate'
+
+KEYS_COMMAND_PLUGIN_FILE = 'propConstraintKeysCommand.py'
+
+
+class WorldMatrixCache(object):
+    """
+    Caches the world matrices of the nodes per frame, evaluated without changing the current time.
+    """
+
+    def __init__(self):
+        self.matrixDict = {}
+
+    def getMatrix(self, inNodeName, inFrame):
+        """
+        Gets the world matrix of a node at a frame.
+
+        Args:
+            inNodeName (str): Name of the node.
+            inFrame (float): Frame to evaluate.
+
+        Returns:
+            MMatrix: World matrix of the node.
+        """
+        key = (inNodeName, inFrame)
+        if key not in self.matrixDict:
+            self.matrixDict[key] = maya.api.OpenMaya.MMatrix(
+                                    maya.cmds.getAttr('{0}.worldMatrix[0]'.format(inNodeName), time=inFrame))
+        return self.matrixDict[key]
+
+
+def getHandoverOffsets(inPropCtrl, inEventTargetList, inMatrixCache):
+    """
+    Computes the offset of the target activated on each switch so the prop does not move on it.
+
+    Args:
+        inPropCtrl (str): Prop control handed over.
+        inEventTargetList (list[tuple(float, str)]): Frame and target control of each switch, sorted by frame.
+        inMatrixCache (WorldMatrixCache): Cache of the world matrices.
+
+    Returns:
+        list[MTransformationMatrix]: Offset of the activated target per switch.
+    """
+    offsetList = []
+    previousTarget = None
+    previousOffset = None
+
+    for frame, target in inEventTargetList:
+        if previousTarget is None:
+            # On the first switch the prop keeps the position it has without the constraint.
+            propWorldMatrix = inMatrixCache.getMatrix(inPropCtrl, frame)
+        else:
+            propWorldMatrix = previousOffset * inMatrixCache.getMatrix(previousTarget, frame)
+
+        offsetMatrix = propWorldMatrix * inMatrixCache.getMatrix(target, frame).inverse()
+        offsetList.append(maya.api.OpenMaya.MTransformationMatrix(offsetMatrix))
+
+        previousTarget = target
+        previousOffset = offsetMatrix
+
+    return offsetList
+
+
+def loadKeysCommand():
+    """
+    Loads the plugin of the command used to key the handover, see core.propConstraintKeysCommand.
+    """
+    pluginPath = os.path.join(os.path.dirname(os.path.abspath(__file__)), KEYS_COMMAND_PLUGIN_FILE)
+
+    if not maya.cmds.pluginInfo(pluginPath, query=True, loaded=True):
+        maya.cmds.loadPlugin(pluginPath, quiet=True)
+
+
+def getHandoverEvents(inHandoverEventList):
+    """
+    Sorts the handover events by frame, merging the events sharing a frame.
+
+    Args:
+        inHandoverEventList (list[tuple(float, str)]): Frame and target control activated at that frame.
+
+    Returns:
+        list[tuple(float, str)]: Events sorted by frame, the last event given wins when several share a frame.
+    """
+    targetByFrame = {}
+    for frame, target in inHandoverEventList:
+        targetByFrame[float(frame)] = target
+
+    return sorted(targetByFrame.items(), key=lambda event: event[0])
+
+
+def createHandover(inPropCtrl, inHandoverEventList):
+    """
+    Constrains the prop control to all the targets of the handover and keys the switches between them.
+
+    The whole handover is done in a single undo chunk.
+
+    Args:
+        inPropCtrl (str): Prop control handed over.
+        inHandoverEventList (list[tuple(float, str)]): Frame and target control activated at that frame,
+                                                       the last event given wins when several share a frame.
+
+    Returns:
+        str: Name of the created parent constraint, None if there is not any switch.
+    """
+    eventTargetList = getHandoverEvents(inHandoverEventList)
+    if not eventTargetList:
+        return None
+
+    targetList = []
+    for _, target in eventTargetList:
+        if target not in targetList:
+            targetList.append(target)
+
+    # Cache all the world matrices before the constraint changes the prop.
+    matrixCache = WorldMatrixCache()
+    offsetList = getHandoverOffsets(inPropCtrl, eventTargetList, matrixCache)
+
+    loadKeysCommand()
+
+    maya.cmds.undoInfo(openChunk=True)
+    try:
+        constraintToDelete = []
+        for constraintType in core.constants.CONSTRAINT_NODE_TYPES:
+            constraintToDelete.extend(maya.cmds.listRelatives(inPropCtrl, type=constraintType) or [])
+        if constraintToDelete:
+            maya.cmds.delete(constraintToDelete)
+
+        constraintName = maya.cmds.parentConstraint(targetList, inPropCtrl, maintainOffset=False)[0]
+        weightAliasList = maya.cmds.parentConstraint(constraintName, query=True, weightAliasList=True)
+
+        frameList = [frame for frame, _ in eventTargetList]
+        keyJobList = []
+
+        for targetIndex, target in enumerate(targetList):
+            # Only the target activated on each switch has weight until the next one.
+            keyJobList.append(['{0}.{1}'.format(constraintName, weightAliasList[targetIndex]),
+                               frameList,
+                               [1.0 if eventTarget == target else 0.0 for _, eventTarget in eventTargetList]])
+
+            targetFrameList = []
+            targetOffsetList = []
+            for (frame, eventTarget), offset in zip(eventTargetList, offsetList):
+                if eventTarget != target:
+                    continue
+                targetFrameList.append(frame)
+                targetOffsetList.append(offset)
+
+            translationList = [offset.translation(maya.api.OpenMaya.MSpace.kTransform)
+                               for offset in targetOffsetList]
+
+            rotateOrder = maya.cmds.getAttr('{0}.rotateOrder'.format(target))
+            rotationList = [offset.rotation().reorder(rotateOrder) for offset in targetOffsetList]
+
+            for axis in core.constants.BASE_TRANSFORM_AXES:
+                keyJobList.append(['{0}.target[{1}].{2}{3}'.format(constraintName,
+                                                                   targetIndex,
+                                                                   OFFSET_TRANSLATE_ATTRIBUTE,
+                                                                   axis.upper()),
+                                   targetFrameList,
+                                   [getattr(translation, axis) for translation in translationList]])
+
+                keyJobList.append(['{0}.target[{1}].{2}{3}'.format(constraintName,
+                                                                   targetIndex,
+                                                                   OFFSET_ROTATE_ATTRIBUTE,
+                                                                   axis.upper()),
+                                   targetFrameList,
+                                   [getattr(rotation, axis) for rotation in rotationList]])
+
+        # One addKeys call per attribute, inside a single undoable command.
+        getattr(maya.cmds, core.propConstraintKeysCommand.COMMAND_NAME)(json.dumps(keyJobList))
+    finally:
+        maya.cmds.undoInfo(closeChunk=True)
+
+    return constraintName
@@ -0,0 +1,100 @@
+"""
+Maya plugin created to key several attributes of the PropConstraint tool in a single undoable command.
+
+Each attribute gets its animation curve replaced by a new one, filled with one MFnAnimCurve.addKeys() call
+with stepped tangents. The curves are created with a MDGModifier and keyed through a MAnimCurveChange, so
+the command is undone and redone as a whole by Maya.
+
+Usage, once the plugin is loaded:
+    maya.cmds.propConstraintBulkKeys(json.dumps([[plug name, [frames], [values]], ...]))
+
+The values are in internal units (radians for the angles).
+"""
+import json
+
+import maya.api.OpenMaya
+import maya.api.OpenMayaAnim
+
+COMMAND_NAME = 'propConstraintBulkKeys'
+
+
+def maya_useNewAPI():
+    """
+    Tells Maya the plugin uses the Python API 2.0.
+    """
+
+
+class PropConstraintBulkKeysCommand(maya.api.OpenMaya.MPxCommand):
+    """
+    Command replacing the animation of several attributes with stepped keys.
+    """
+
+    def __init__(self):
+        maya.api.OpenMaya.MPxCommand.__init__(self)
+
+        self.dgModifier = maya.api.OpenMaya.MDGModifier()
+        self.animCurveChange = maya.api.OpenMayaAnim.MAnimCurveChange()
+
+    @staticmethod
+    def creator():
+        return PropConstraintBulkKeysCommand()
+
+    @staticmethod
+    def createSyntax():
+        syntax = maya.api.OpenMaya.MSyntax()
+        syntax.addArg(maya.api.OpenMaya.MSyntax.kString)
+        return syntax
+
+    def isUndoable(self):
+        return True
+
+    def doIt(self, args):
+        argParser = maya.api.OpenMaya.MArgParser(self.syntax(), args)
+        keyJobList = json.loads(argParser.commandArgumentString(0))
+
+        plugList = []
+        for plugName, _, _ in keyJobList:
+            selectionList = maya.api.OpenMaya.MSelectionList()
+            selectionList.add(plugName)
+            plugList.append(selectionList.getPlug(0))
+
+        # Delete the previous animation curves, to key the attributes from scratch.
+        for plug in plugList:
+            sourcePlug = plug.source()
+            if not sourcePlug.isNull and sourcePlug.node().hasFn(maya.api.OpenMaya.MFn.kAnimCurve):
+                self.dgModifier.deleteNode(sourcePlug.node())
+        self.dgModifier.doIt()
+
+        animCurveFn = maya.api.OpenMayaAnim.MFnAnimCurve()
+        timeUnit = maya.api.OpenMaya.MTime.uiUnit()
+
+        for plug, (_, frameList, valueList) in zip(plugList, keyJobList):
+            animCurveFn.create(plug, maya.api.OpenMayaAnim.MFnAnimCurve.kAnimCurveUnknown, self.dgModifier)
+            self.dgModifier.doIt()
+
+            animCurveFn.addKeys([maya.api.OpenMaya.MTime(frame, timeUnit) for frame in frameList],
+                                valueList,
+                                maya.api.OpenMayaAnim.MFnAnimCurve.kTangentStep,
+                                maya.api.OpenMayaAnim.MFnAnimCurve.kTangentStep,
+                                False,
+                                self.animCurveChange)
+
+    def redoIt(self):
+        self.dgModifier.doIt()
+        self.animCurveChange.redoIt()
+
+    def undoIt(self):
+        self.animCurveChange.undoIt()
+        self.dgModifier.undoIt()
+
+
+def initializePlugin(inPluginObject):
+    pluginFn = maya.api.OpenMaya.MFnPlugin(inPluginObject)
+    pluginFn.registerCommand(COMMAND_NAME,
+                             PropConstraintBulkKeysCommand.creator,
+                             PropConstraintBulkKeysCommand.createSyntax)
+
+
+def uninitializePlugin(inPluginObject):
+    pluginFn = maya.api.OpenMaya.MFnPlugin(inPluginObject)
+    pluginFn.deregisterCommand(COMMAND_NAME)
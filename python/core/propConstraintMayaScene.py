@@ -0,0 +1,205 @@
+"""
+Module created to read and evaluate the constraints of the prop controls in the open Maya scene.
+
+It is the Maya scene used by the profiler (core.propConstraintProfiler) and the setup export
+(core.propConstraintSetup).
+"""
+import maya.api.OpenMaya
+import maya.cmds
+
+import core.constants
+import core.propConstraintCore
+import core.propConstraintProfiler
+
+
+class MayaConstraintScene(object):
+    """
+    Scene used to read and evaluate the constraints of the prop controls of the open Maya scene.
+
+    Only the constraints driving controls with the ParentAttr attribute are taken, the internal
+    constraints of the rigs are ignored.
+    """
+
+    def __init__(self):
+        self.outputPlugDict = {}
+
+    def iterConstraints(self, inNamespaceList=None):
+        """
+        Gets the constraints of the scene constraining the prop controls.
+
+        Args:
+            inNamespaceList (list[str]): Namespaces of the props, all the prop namespaces if None.
+
+        Yield:
+            ConstraintRecord: Data of the constraint.
+        """
+        namespaceFilter = None
+        if inNamespaceList:
+            namespaceFilter = set(namespace.rstrip(':') for namespace in inNamespaceList)
+
+        for constraintName in maya.cmds.ls(type=core.constants.CONSTRAINT_NODE_TYPES) or []:
+            control = self.getConstrainedControl(constraintName)
+            if not control:
+                continue
+
+            namespace = core.propConstraintProfiler.getNamespaceFromName(control)
+            if namespaceFilter is not None and namespace not in namespaceFilter:
+                continue
+
+            if not maya.cmds.attributeQuery(core.propConstraintCore.DESIRED_CONTROL_ATTRIBUTE,
+                                            node=control,
+                                            exists=True):
+                continue
+
+            constraintType = maya.cmds.nodeType(constraintName)
+            targetList = getattr(maya.cmds, constraintType)(constraintName, query=True, targetList=True) or []
+
+            constraintRecord = core.propConstraintProfiler.ConstraintRecord(
+                                    constraintName,
+                                    constraintType,
+                                    namespace,
+                                    control,
+                                    tuple(targetList),
+                                    self.getConnectedAxes(constraintName,
+                                                          core.constants.CONSTRAINT_TRANSLATE_OUTPUT),
+                                    self.getConnectedAxes(constraintName,
+                                                          core.constants.CONSTRAINT_ROTATE_OUTPUT))
+
+            # The plug is found once, so the evaluations only pull it.
+            self.outputPlugDict[constraintName] = self.getOutputPlug(constraintRecord)
+
+            yield constraintRecord
+
+    @staticmethod
+    def getConstrainedControl(inConstraintName):
+        """
+        Gets the control driven by the constraint.
+
+        Args:
+            inConstraintName (str): Name of the constraint node.
+
+        Returns:
+            str: Name of the constrained control, None if it can not be found.
+        """
+        controlList = maya.cmds.listConnections('{0}.constraintParentInverseMatrix'.format(inConstraintName),
+                                                source=True,
+                                                destination=False)
+        if not controlList:
+            controlList = maya.cmds.listRelatives(inConstraintName, parent=True)
+
+        if not controlList:
+            return None
+
+        return controlList[0]
+
+    @staticmethod
+    def getConnectedAxes(inConstraintName, inOutputAttribute):
+        """
+        Gets the axes of an output of the constraint that drive the control.
+
+        Args:
+            inConstraintName (str): Name of the constraint node.
+            inOutputAttribute (str): Output attribute, ex: 'constraintTranslate'.
+
+        Returns:
+            tuple(str): Connected axes, empty if the constraint does not have the output or all are skipped.
+        """
+        if not maya.cmds.attributeQuery(inOutputAttribute, node=inConstraintName, exists=True):
+            return ()
+
+        connectedAxes = []
+        for axis in core.constants.BASE_TRANSFORM_AXES:
+            plug = '{0}.{1}{2}'.format(inConstraintName, inOutputAttribute, axis.upper())
+            if maya.cmds.listConnections(plug, source=False, destination=True):
+                connectedAxes.append(axis)
+
+        return tuple(connectedAxes)
+
+    @staticmethod
+    def getOutputPlug(inConstraintRecord):
+        """
+        Gets the plug pulled to evaluate the constraint, the first connected axis of its outputs.
+
+        Args:
+            inConstraintRecord (ConstraintRecord): Constraint to evaluate.
+
+        Returns:
+            MPlug: Output plug of the constraint, None if none of its outputs is connected.
+        """
+        if inConstraintRecord.translateAxes:
+            outputAttribute = core.constants.CONSTRAINT_TRANSLATE_OUTPUT
+            axis = inConstraintRecord.translateAxes[0]
+        elif inConstraintRecord.rotateAxes:
+            outputAttribute = core.constants.CONSTRAINT_ROTATE_OUTPUT
+            axis = inConstraintRecord.rotateAxes[0]
+        else:
+            return None
+
+        selectionList = maya.api.OpenMaya.MSelectionList()
+        selectionList.add('{0}.{1}{2}'.format(inConstraintRecord.name, outputAttribute, axis.upper()))
+
+        return selectionList.getPlug(0)
+
+    @staticmethod
+    def setFrame(inFrame):
+        """
+        Sets the frame to evaluate.
+
+        Args:
+            inFrame (float): Frame to move the scene to.
+        """
+        maya.cmds.currentTime(inFrame, update=False)
+
+    @staticmethod
+    def evaluateTargets(inTargetList):
+        """
+        Pulls the world matrix of the targets so the rigs driving them are evaluated at the current frame.
+
+        Args:
+            inTargetList (list[str]): Target nodes.
+        """
+        for target in inTargetList:
+            maya.cmds.getAttr('{0}.worldMatrix[0]'.format(target))
+
+    def evaluateConstraint(self, inConstraintRecord):
+        """
+        Pulls a single output of the constraint through the API, so the DG computes it at the current frame.
+
+        Once the output is clean, pulling it again only costs the read of the plug, which the profiler
+        measures and subtracts.
+
+        Args:
+            inConstraintRecord (ConstraintRecord): Constraint to evaluate.
+        """
+        outputPlug = self.outputPlugDict.get(inConstraintRecord.name)
+        if outputPlug is not None:
+            outputPlug.asDouble()
+
+
+def runBenchmark(inSceneFilePath, inStartFrame, inEndFrame, inNamespaceList=None, inRepeat=3):
+    """
+    Opens a benchmark scene and profiles its prop constraints several times, keeping the fastest run.
+
+    Run it from mayapy on the same benchmark scene with each release to track the regressions.
+
+    Args:
+        inSceneFilePath (str): Path of the benchmark scene.
+        inStartFrame (int): First frame of the range.
+        inEndFrame (int): Last frame of the range, included.
+        inNamespaceList (list[str]): Namespaces of the props, all the prop namespaces if None.
+        inRepeat (int): Number of runs.
+
+    Returns:
+        dict: Report of the fastest run, see ProfileReport.toDict().
+    """
+    maya.cmds.file(inSceneFilePath, open=True, force=True)
+
+    profiler = core.propConstraintProfiler.ConstraintProfiler(MayaConstraintScene())
+    bestReport = None
+
+    for _ in range(max(inRepeat, 1)):
+        report = profiler.profile(inStartFrame, inEndFrame, inNamespaceList)
+        if bestReport is None or report.totalTime < bestReport.totalTime:
+            bestReport = report
+
+    return bestReport.toDict()
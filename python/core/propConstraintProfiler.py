@@ -0,0 +1,400 @@
+"""
+Module created to profile the playback cost of the constraints created by the PropConstraint tool.
+
+The profiler works over a scene object, which can be the open Maya scene (see core.propConstraintMayaScene)
+or a scene stand-in (StandInConstraintScene). This module does not need Maya, so the profiling and the
+reports can be tested outside of it.
+"""
+import collections
+import timeit
+
+ConstraintRecord = collections.namedtuple('ConstraintRecord', ['name',
+                                                               'type',
+                                                               'namespace',
+                                                               'control',
+                                                               'targets',
+                                                               'translateAxes',
+                                                               'rotateAxes'])
+
+ProfileIssue = collections.namedtuple('ProfileIssue', ['kind',
+                                                       'control',
+                                                       'constraints',
+                                                       'message'])
+
+# Kind of issues reported by the profiler.
+ISSUE_STACKED_CONSTRAINTS = 'stackedConstraints'
+ISSUE_SKIP_ALL_AXES = 'skipAllAxes'
+
+# Same as core.constants.BASE_TRANSFORM_AXES, which can not be imported without Maya.
+STAND_IN_AXES = ('x', 'y', 'z')
+
+# Seconds the stand-in scene spends per target and connected axis of a constraint.
+STAND_IN_AXIS_COST = 0.001
+
+# Seconds the stand-in scene spends on each call evaluating a constraint, even if it is already evaluated.
+STAND_IN_CALL_COST = 0.01
+
+
+def getNamespaceFromName(inNodeName):
+    """
+    Gets the namespace of a node name.
+
+    Args:
+        inNodeName (str): Node name, with or without namespace.
+
+    Returns:
+        str: Namespace of the node, empty string if the node has not namespace.
+    """
+    return inNodeName.rpartition('|')[-1].rpartition(':')[0]
+
+
+class StandInConstraintScene(object):
+    """
+    Scene stand-in used to check the profiler and its reports without Maya.
+
+    The evaluation of the constraints does not do any work: it advances the clock of the stand-in by
+    a call cost, plus a cost proportional to the number of targets and connected axes the first time
+    a constraint is evaluated at a frame, like a clean plug in Maya. Pass its timer() to the
+    ConstraintProfiler to get deterministic timings.
+
+    Args:
+        inConstraintRecordList (list[ConstraintRecord]): Constraints of the stand-in scene.
+        inCallCost (float): Seconds spent on each call evaluating a constraint.
+    """
+
+    def __init__(self, inConstraintRecordList, inCallCost=STAND_IN_CALL_COST):
+        self.constraintRecordList = list(inConstraintRecordList)
+        self.callCost = inCallCost
+        self.frame = 0.0
+        self.clock = 0.0
+        self.evaluatedSet = set()
+
+    @classmethod
+    def fromSetupSize(cls,
+                      inPropCount,
+                      inControlsPerProp=2,
+                      inTargetsPerConstraint=2,
+                      inStackedCount=0,
+                      inSkipAllAxesCount=0):
+        """
+        Builds a stand-in scene with parent constraints on every control of the props.
+
+        Args:
+            inPropCount (int): Number of props in the scene.
+            inControlsPerProp (int): Number of constrained controls per prop.
+            inTargetsPerConstraint (int): Number of targets per constraint.
+            inStackedCount (int): Number of controls with a second constraint stacked on them.
+            inSkipAllAxesCount (int): Number of controls with an extra constraint skipping all the axes.
+
+        Returns:
+            StandInConstraintScene: The stand-in scene.
+        """
+        constraintRecordList = []
+        for propIndex in range(inPropCount):
+            namespace = 'prp_standIn_{0:03d}'.format(propIndex)
+
+            for controlIndex in range(inControlsPerProp):
+                control = '{0}:control_{1:02d}_ctrl'.format(namespace, controlIndex)
+                targetList = tuple('chr_standIn:target_{0:02d}_ctrl'.format(targetIndex)
+                                   for targetIndex in range(inTargetsPerConstraint))
+
+                constraintRecordList.append(ConstraintRecord('{0}_parentConstraint1'.format(control),
+                                                             'parentConstraint',
+                                                             namespace,
+                                                             control,
+                                                             targetList,
+                                                             STAND_IN_AXES,
+                                                             STAND_IN_AXES))
+
+        controlRecordList = list(constraintRecordList)
+
+        for constraintRecord in controlRecordList[:inStackedCount]:
+            constraintRecordList.append(constraintRecord._replace(
+                                            name='{0}_pointConstraint1'.format(constraintRecord.control),
+                                            type='pointConstraint',
+                                            rotateAxes=()))
+
+        for constraintRecord in controlRecordList[:inSkipAllAxesCount]:
+            constraintRecordList.append(constraintRecord._replace(
+                                            name='{0}_orientConstraint1'.format(constraintRecord.control),
+                                            type='orientConstraint',
+                                            translateAxes=(),
+                                            rotateAxes=()))
+
+        return cls(constraintRecordList)
+
+    def iterConstraints(self, inNamespaceList=None):
+        """
+        Gets the constraints of the stand-in scene.
+
+        Args:
+            inNamespaceList (list[str]): Namespaces of the props to profile, all of them if None.
+
+        Yield:
+            ConstraintRecord: Data of the constraint.
+        """
+        namespaceFilter = None
+        if inNamespaceList:
+            namespaceFilter = set(namespace.rstrip(':') for namespace in inNamespaceList)
+
+        for constraintRecord in self.constraintRecordList:
+            if namespaceFilter is not None and constraintRecord.namespace not in namespaceFilter:
+                continue
+            yield constraintRecord
+
+    def timer(self):
+        """
+        Gets the clock of the stand-in scene.
+
+        Returns:
+            float: Seconds spent evaluating the stand-in constraints.
+        """
+        return self.clock
+
+    def setFrame(self, inFrame):
+        """
+        Sets the frame to evaluate.
+
+        Args:
+            inFrame (float): Frame to move the stand-in scene to.
+        """
+        self.frame = float(inFrame)
+        self.evaluatedSet.clear()
+
+    def evaluateTargets(self, inTargetList):
+        """
+        Evaluates the targets of the constraints, the stand-in targets do not have any cost.
+
+        Args:
+            inTargetList (list[str]): Target nodes.
+        """
+
+    def evaluateConstraint(self, inConstraintRecord):
+        """
+        Evaluates the constraint of the stand-in scene.
+
+        Args:
+            inConstraintRecord (ConstraintRecord): Constraint to evaluate.
+        """
+        self.clock += self.callCost
+        if inConstraintRecord.name in self.evaluatedSet:
+            return
+
+        self.evaluatedSet.add(inConstraintRecord.name)
+        axesCount = len(inConstraintRecord.translateAxes) + len(inConstraintRecord.rotateAxes)
+        self.clock += STAND_IN_AXIS_COST * axesCount * len(inConstraintRecord.targets)
+
+
+class ProfileReport(object):
+    """
+    Result of the profiling of the constraints over a frame range.
+
+    Args:
+        inConstraintRecordList (list[ConstraintRecord]): Profiled constraints.
+        inFrameCount (int): Number of evaluated frames.
+    """
+
+    def __init__(self, inConstraintRecordList, inFrameCount):
+        self.constraintRecordList = list(inConstraintRecordList)
+        self.frameCount = inFrameCount
+
+        self.nodeTimings = dict((constraintRecord.name, 0.0) for constraintRecord in self.constraintRecordList)
+        self.issues = []
+
+    @property
+    def totalTime(self):
+        """
+        Gets the time spent evaluating all the constraints.
+
+        Returns:
+            float: Time in seconds.
+        """
+        return sum(self.nodeTimings.values())
+
+    @property
+    def namespaceTimings(self):
+        """
+        Gets the time spent evaluating the constraints of each prop namespace.
+
+        Returns:
+            dict: {namespace: time in seconds}
+        """
+        namespaceTimings = collections.defaultdict(float)
+        for constraintRecord in self.constraintRecordList:
+            namespaceTimings[constraintRecord.namespace] += self.nodeTimings[constraintRecord.name]
+
+        return dict(namespaceTimings)
+
+    def rankedNodes(self):
+        """
+        Gets the constraints sorted from the most to the least expensive.
+
+        Returns:
+            list[tuple(ConstraintRecord, float)]: Constraint and its time in seconds.
+        """
+        return sorted(((constraintRecord, self.nodeTimings[constraintRecord.name])
+                       for constraintRecord in self.constraintRecordList),
+                      key=lambda item: item[1],
+                      reverse=True)
+
+    def rankedNamespaces(self):
+        """
+        Gets the prop namespaces sorted from the most to the least expensive.
+
+        Returns:
+            list[tuple(str, float)]: Namespace and its time in seconds.
+        """
+        return sorted(self.namespaceTimings.items(), key=lambda item: item[1], reverse=True)
+
+    def toDict(self):
+        """
+        Gets the report as a dict, to store the results of the benchmarks.
+
+        Returns:
+            dict: Timings and issues of the report.
+        """
+        return {'frameCount': self.frameCount,
+                'totalTime': self.totalTime,
+                'nodes': [{'name': constraintRecord.name,
+                           'namespace': constraintRecord.namespace,
+                           'control': constraintRecord.control,
+                           'time': nodeTime}
+                          for constraintRecord, nodeTime in self.rankedNodes()],
+                'namespaces': [{'namespace': namespace, 'time': namespaceTime}
+                               for namespace, namespaceTime in self.rankedNamespaces()],
+                'issues': [dict(issue._asdict()) for issue in self.issues]}
+
+    def formatReport(self, inMaxNodes=20):
+        """
+        Gets the ranked report as text.
+
+        Args:
+            inMaxNodes (int): Maximum number of constraints listed.
+
+        Returns:
+            str: The report.
+        """
+        frameCount = max(self.frameCount, 1)
+        lineList = ['Constraint playback cost: {0:.3f} ms/frame over {1} frame(s)'.format(
+                                                                    self.totalTime * 1000.0 / frameCount,
+                                                                    self.frameCount),
+                    '',
+                    'Namespaces:']
+
+        for namespace, namespaceTime in self.rankedNamespaces():
+            lineList.append('    {0:>10.3f} ms/frame  {1}'.format(namespaceTime * 1000.0 / frameCount,
+                                                                 namespace or ':'))
+
+        lineList.extend(['', 'Constraints:'])
+        for constraintRecord, nodeTime in self.rankedNodes()[:inMaxNodes]:
+            lineList.append('    {0:>10.3f} ms/frame  {1} -> {2}'.format(nodeTime * 1000.0 / frameCount,
+                                                                      constraintRecord.name,
+                                                                      constraintRecord.control))
+
+        if self.issues:
+            lineList.extend(['', 'Issues:'])
+            for issue in self.issues:
+                lineList.append('    [{0}] {1}'.format(issue.kind, issue.message))
+
+        return '\n'.join(lineList)
+
+
+class ConstraintProfiler(object):
+    """
+    Profiles the evaluation of the constrained prop hierarchies over a frame range.
+
+    Args:
+        inScene (MayaConstraintScene or StandInConstraintScene): Scene to profile.
+        inTimer (callable): Clock used to measure the evaluations, timeit.default_timer if None.
+    """
+
+    def __init__(self, inScene, inTimer=None):
+        self.scene = inScene
+        self.timer = inTimer or timeit.default_timer
+
+    def profile(self, inStartFrame, inEndFrame, inNamespaceList=None):
+        """
+        Evaluates each constraint at every frame of the range and attributes the time spent on it.
+
+        The targets are evaluated before timing the constraints of each frame, so the cost of the rigs
+        driving the targets is not charged to the first constraint pulling them. Each constraint is then
+        evaluated twice: the second evaluation reads clean outputs and only measures the cost of the call,
+        which is subtracted so only the compute of the constraint is charged to it.
+
+        Args:
+            inStartFrame (int): First frame of the range.
+            inEndFrame (int): Last frame of the range, included.
+            inNamespaceList (list[str]): Namespaces of the props to profile, all of them if None.
+
+        Returns:
+            ProfileReport: Timings and issues of the constraints.
+        """
+        constraintRecordList = list(self.scene.iterConstraints(inNamespaceList))
+        frameList = range(int(inStartFrame), int(inEndFrame) + 1)
+
+        targetList = []
+        for constraintRecord in constraintRecordList:
+            for target in constraintRecord.targets:
+                if target not in targetList:
+                    targetList.append(target)
+
+        report = ProfileReport(constraintRecordList, len(frameList))
+        report.issues = self.findIssues(constraintRecordList)
+
+        timer = self.timer
+        nodeTimings = report.nodeTimings
+
+        for frame in frameList:
+            self.scene.setFrame(frame)
+            self.scene.evaluateTargets(targetList)
+
+            for constraintRecord in constraintRecordList:
+                startTime = timer()
+                self.scene.evaluateConstraint(constraintRecord)
+                computeTime = timer() - startTime
+
+                startTime = timer()
+                self.scene.evaluateConstraint(constraintRecord)
+                callTime = timer() - startTime
+
+                nodeTimings[constraintRecord.name] += max(computeTime - callTime, 0.0)
+
+        return report
+
+    @staticmethod
+    def findIssues(inConstraintRecordList):
+        """
+        Finds the constraints left behind that only add cost to the playback.
+
+        Args:
+            inConstraintRecordList (list[ConstraintRecord]): Constraints to check.
+
+        Returns:
+            list[ProfileIssue]: Stacked constraints per control and constraints skipping all their axes.
+        """
+        issueList = []
+        constraintsByControl = collections.OrderedDict()
+
+        for constraintRecord in inConstraintRecordList:
+            constraintsByControl.setdefault(constraintRecord.control, []).append(constraintRecord.name)
+
+            if not constraintRecord.translateAxes and not constraintRecord.rotateAxes:
+                issueList.append(ProfileIssue(ISSUE_SKIP_ALL_AXES,
+                                              constraintRecord.control,
+                                              (constraintRecord.name,),
+                                              '{0} skips all the axes of {1}, it can be deleted'.format(
+                                                                            constraintRecord.name,
+                                                                            constraintRecord.control)))
+
+        for control, constraintList in constraintsByControl.items():
+            if len(constraintList) < 2:
+                continue
+
+            issueList.append(ProfileIssue(ISSUE_STACKED_CONSTRAINTS,
+                                          control,
+                                          tuple(constraintList),
+                                          '{0} is driven by {1} constraints: {2}'.format(control,
+                                                                                         len(constraintList),
+                                                                                         ', '.join(constraintList))))
+
+        return issueList
@@ -0,0 +1,226 @@
+"""
+Module created to export the constraint setup of the PropConstraint tool from a scene and import it in another one.
+
+The setup files are written and read by core.propConstraintSetupFile, record by record.
+"""
+import itertools
+
+import maya.cmds
+
+import core.constants
+import core.propConstraintCore
+import core.propConstraintMayaScene
+import core.propConstraintSetupFile
+
+# Number of records applied together on import.
+IMPORT_CHUNK_SIZE = 500
+
+
+def getConstraintOffsets(inConstraintName, inConstraintType, inTargetCount):
+    """
+    Gets the offsets of a constraint.
+
+    Args:
+        inConstraintName (str): Name of the constraint node.
+        inConstraintType (str): Node type of the constraint.
+        inTargetCount (int): Number of targets of the constraint.
+
+    Returns:
+        list[float]: Translate and rotate offset per target for parent constraints, the offset otherwise.
+    """
+    if inConstraintType != 'parentConstraint':
+        return list(maya.cmds.getAttr('{0}.offset'.format(inConstraintName))[0])
+
+    offsetList = []
+    for targetIndex in range(inTargetCount):
+        for offsetAttribute in ('targetOffsetTranslate', 'targetOffsetRotate'):
+            offsetList.extend(maya.cmds.getAttr('{0}.target[{1}].{2}'.format(inConstraintName,
+                                                                            targetIndex,
+                                                                            offsetAttribute))[0])
+    return offsetList
+
+
+def iterSceneSetup(inNamespaceList=None, inPoseReferenceDict=None):
+    """
+    Gets the constraint setup of the prop controls of the scene, the controls with ParentAttr.
+
+    Args:
+        inNamespaceList (list[str]): Namespaces of the props to export, all the prop namespaces if None.
+        inPoseReferenceDict (dict): {prop namespace: pose file path} loaded on the props.
+
+    Yield:
+        SetupRecord: Setup of a constraint.
+    """
+    poseReferenceDict = dict((namespace.rstrip(':'), posePath)
+                             for namespace, posePath in (inPoseReferenceDict or {}).items())
+
+    scene = core.propConstraintMayaScene.MayaConstraintScene()
+    for constraintRecord in scene.iterConstraints(inNamespaceList):
+        yield core.propConstraintSetupFile.SetupRecord(constraintRecord.namespace,
+                                                       constraintRecord.control.rpartition(':')[-1],
+                                                       constraintRecord.type,
+                                                       list(constraintRecord.targets),
+                                                       [axis for axis in core.constants.BASE_TRANSFORM_AXES
+                                                        if axis not in constraintRecord.translateAxes],
+                                                       [axis for axis in core.constants.BASE_TRANSFORM_AXES
+                                                        if axis not in constraintRecord.rotateAxes],
+                                                       getConstraintOffsets(constraintRecord.name,
+                                                                            constraintRecord.type,
+                                                                            len(constraintRecord.targets)),
+                                                       poseReferenceDict.get(constraintRecord.namespace))
+
+
+def exportSetup(inFilePath, inNamespaceList=None, inPoseReferenceDict=None):
+    """
+    Exports the constraint setup of the prop controls of the scene to a file.
+
+    Args:
+        inFilePath (str): Path of the file, compressed with gzip if it ends with '.gz'.
+        inNamespaceList (list[str]): Namespaces of the props to export, all the prop namespaces if None.
+        inPoseReferenceDict (dict): {prop namespace: pose file path} loaded on the props.
+
+    Returns:
+        int: Number of constraints exported.
+    """
+    return core.propConstraintSetupFile.writeSetup(inFilePath, iterSceneSetup(inNamespaceList, inPoseReferenceDict))
+
+
+def applySetupRecords(inSetupRecordList, inClearedControlSet=None):
+    """
+    Creates the constraints of the setup records, replacing the constraints of the controls.
+
+    Only the prop controls, the controls with ParentAttr, are modified.
+
+    Args:
+        inSetupRecordList (list[SetupRecord]): Setup to apply.
+        inClearedControlSet (set[str]): Controls whose previous constraints were already deleted, it is
+                                        updated with the controls cleared by this call. The constraints
+                                        stacked on a control are kept when its records are split in
+                                        several calls.
+
+    Returns:
+        list[SetupRecord]: Records skipped because the control is not a prop control in the scene, its
+                           targets are missing or its type is not a constraint of the tool.
+    """
+    clearedControlSet = inClearedControlSet if inClearedControlSet is not None else set()
+
+    controlNameList = ['{0}:{1}'.format(setupRecord.namespace, setupRecord.control) if setupRecord.namespace
+                       else setupRecord.control
+                       for setupRecord in inSetupRecordList]
+
+    controlAttributeList = ['{0}.{1}'.format(controlName, core.propConstraintCore.DESIRED_CONTROL_ATTRIBUTE)
+                            for controlName in controlNameList]
+
+    # Single query to know which of the controls, ParentAttr plugs and targets of the chunk exist.
+    queriedNames = set(controlNameList)
+    queriedNames.update(controlAttributeList)
+    for setupRecord in inSetupRecordList:
+        queriedNames.update(setupRecord.targets or [])
+    existingNames = set(maya.cmds.ls(list(queriedNames)) or [])
+
+    skippedRecordList = []
+    validRecordList = []
+    for controlName, controlAttribute, setupRecord in zip(controlNameList, controlAttributeList, inSetupRecordList):
+        # The type is checked before it is used as the name of the command creating the constraint.
+        if setupRecord.type not in core.constants.CONSTRAINT_NODE_TYPES \
+                or controlName not in existingNames or controlAttribute not in existingNames \
+                or not setupRecord.targets or not existingNames.issuperset(setupRecord.targets):
+            skippedRecordList.append(setupRecord)
+            continue
+        validRecordList.append((controlName, setupRecord))
+
+    constraintToDelete = set()
+    for controlName in set(controlName for controlName, _ in validRecordList) - clearedControlSet:
+        for constraintType in core.constants.CONSTRAINT_NODE_TYPES:
+            constraintToDelete.update(maya.cmds.listRelatives(controlName, type=constraintType) or [])
+        clearedControlSet.add(controlName)
+
+    # The constraints coming from a reference can not be deleted, they are kept.
+    constraintToDelete.difference_update(maya.cmds.ls(list(constraintToDelete), referencedNodes=True) or [])
+
+    if constraintToDelete:
+        maya.cmds.delete(list(constraintToDelete))
+
+    for controlName, setupRecord in validRecordList:
+        constraintCommand = getattr(maya.cmds, setupRecord.type)
+
+        if setupRecord.type == 'parentConstraint':
+            constraintName = constraintCommand(setupRecord.targets,
+                                               controlName,
+                                               maintainOffset=False,
+                                               skipTranslate=setupRecord.skipTranslate or 'none',
+                                               skipRotate=setupRecord.skipRotate or 'none')[0]
+        elif setupRecord.type == 'pointConstraint':
+            constraintName = constraintCommand(setupRecord.targets,
+                                               controlName,
+                                               maintainOffset=False,
+                                               skip=setupRecord.skipTranslate or 'none')[0]
+        else:
+            constraintName = constraintCommand(setupRecord.targets,
+                                               controlName,
+                                               maintainOffset=False,
+                                               skip=setupRecord.skipRotate or 'none')[0]
+
+        setConstraintOffsets(constraintName, setupRecord.type, setupRecord.offsets)
+
+    return skippedRecordList
+
+
+def setConstraintOffsets(inConstraintName, inConstraintType, inOffsetList):
+    """
+    Sets the offsets of a constraint, see getConstraintOffsets().
+
+    Args:
+        inConstraintName (str): Name of the constraint node.
+        inConstraintType (str): Node type of the constraint.
+        inOffsetList (list[float]): Offsets to set.
+    """
+    if not inOffsetList:
+        return
+
+    if inConstraintType != 'parentConstraint':
+        maya.cmds.setAttr('{0}.offset'.format(inConstraintName), *inOffsetList[:3])
+        return
+
+    for targetIndex in range(len(inOffsetList) // 6):
+        targetOffsets = inOffsetList[targetIndex * 6:targetIndex * 6 + 6]
+        maya.cmds.setAttr('{0}.target[{1}].targetOffsetTranslate'.format(inConstraintName, targetIndex),
+                          *targetOffsets[:3])
+        maya.cmds.setAttr('{0}.target[{1}].targetOffsetRotate'.format(inConstraintName, targetIndex),
+                          *targetOffsets[3:])
+
+
+def importSetup(inFilePath, inNamespaceMapping=None):
+    """
+    Imports the constraint setup of a file in the scene, in a single undo chunk.
+
+    Args:
+        inFilePath (str): Path of the file.
+        inNamespaceMapping (dict): {source namespace: destination namespace} to remap the setup.
+
+    Returns:
+        tuple(dict, list[SetupRecord]): {prop namespace: pose file path} referenced by the setup and the
+                                        records skipped because their nodes are not in the scene.
+    """
+    poseReferenceDict = {}
+    skippedRecordList = []
+    clearedControlSet = set()
+
+    setupRecords = core.propConstraintSetupFile.readSetup(inFilePath, inNamespaceMapping)
+
+    maya.cmds.undoInfo(openChunk=True)
+    try:
+        while True:
+            setupRecordList = list(itertools.islice(setupRecords, IMPORT_CHUNK_SIZE))
+            if not setupRecordList:
+                break
+
+            for setupRecord in setupRecordList:
+                if setupRecord.pose:
+                    poseReferenceDict[setupRecord.namespace] = setupRecord.pose
+
+            skippedRecordList.extend(applySetupRecords(setupRecordList, clearedControlSet))
+    finally:
+        maya.cmds.undoInfo(closeChunk=True)
+
+    return poseReferenceDict, skippedRecordList
@@ -0,0 +1,167 @@
+"""
+Module created to write and read the constraint setup files of the PropConstraint tool.
+
+The setup is written as a versioned JSON lines file: a header line followed by one compact line per
+constraint, so big setups are streamed record by record instead of being built in memory. This module does
+not need Maya, see core.propConstraintSetup to export and import the setup of a scene.
+"""
+import collections
+import gzip
+import itertools
+import json
+
+SETUP_FORMAT_NAME = 'propConstraintSetup'
+SETUP_FORMAT_VERSION = 1
+
+# Order of the values of each record line of the file.
+SETUP_RECORD_FIELDS = ('namespace',
+                       'control',
+                       'type',
+                       'targets',
+                       'skipTranslate',
+                       'skipRotate',
+                       'offsets',
+                       'pose')
+
+SetupRecord = collections.namedtuple('SetupRecord', SETUP_RECORD_FIELDS)
+
+
+class SetupFileError(Exception):
+    """
+    Raised when a constraint setup file can not be read.
+    """
+
+
+def openSetupFile(inFilePath, inMode):
+    """
+    Opens a setup file, compressed with gzip when its extension is '.gz'.
+
+    Args:
+        inFilePath (str): Path of the file.
+        inMode (str): 'r' to read, 'w' to write.
+
+    Returns:
+        file: The opened file.
+    """
+    if inFilePath.endswith('.gz'):
+        # Text mode only exists in the gzip module of Python 3.
+        return gzip.open(inFilePath, inMode + ('b' if str is bytes else 't'))
+
+    return open(inFilePath, inMode)
+
+
+def remapNamespace(inNamespace, inNamespaceMapping):
+    """
+    Replaces the leading part of a namespace by the one given in the mapping.
+
+    The longest mapped namespace wins, so 'chr_a:sub' is remapped by a mapping of 'chr_a:sub' before
+    a mapping of 'chr_a'.
+
+    Args:
+        inNamespace (str): Namespace, without ':' at the end. Ex: 'chr_a:sub'.
+        inNamespaceMapping (dict): {source namespace: destination namespace}
+
+    Returns:
+        str: The remapped namespace, the same namespace if it is not mapped.
+    """
+    if not inNamespaceMapping or not inNamespace:
+        return inNamespace
+
+    namespacePartList = inNamespace.split(':')
+    for partCount in range(len(namespacePartList), 0, -1):
+        leadingNamespace = ':'.join(namespacePartList[:partCount])
+        if leadingNamespace not in inNamespaceMapping:
+            continue
+
+        remappedPartList = namespacePartList[partCount:]
+        if inNamespaceMapping[leadingNamespace]:
+            remappedPartList.insert(0, inNamespaceMapping[leadingNamespace])
+        return ':'.join(remappedPartList)
+
+    return inNamespace
+
+
+def remapName(inNodeName, inNamespaceMapping):
+    """
+    Replaces the namespace of a node name by the one given in the mapping, see remapNamespace().
+
+    Args:
+        inNodeName (str): Node name with namespace.
+        inNamespaceMapping (dict): {source namespace: destination namespace}
+
+    Returns:
+        str: Node name with the new namespace, the same name if its namespace is not mapped.
+    """
+    namespace, _, name = inNodeName.rpartition(':')
+    namespace = remapNamespace(namespace, inNamespaceMapping)
+
+    return '{0}:{1}'.format(namespace, name) if namespace else name
+
+
+def writeSetup(inFilePath, inSetupRecords):
+    """
+    Writes the constraint setup to a file, one record at a time.
+
+    Args:
+        inFilePath (str): Path of the file, compressed with gzip if it ends with '.gz'.
+        inSetupRecords (iterable[SetupRecord]): Setup to write.
+
+    Returns:
+        int: Number of records written.
+    """
+    recordCount = 0
+    with openSetupFile(inFilePath, 'w') as setupFile:
+        setupFile.write(json.dumps({'format': SETUP_FORMAT_NAME,
+                                    'version': SETUP_FORMAT_VERSION,
+                                    'fields': SETUP_RECORD_FIELDS},
+                                   separators=(',', ':')))
+        setupFile.write('\n')
+
+        for setupRecord in inSetupRecords:
+            setupFile.write(json.dumps(list(setupRecord), separators=(',', ':')))
+            setupFile.write('\n')
+            recordCount += 1
+
+    return recordCount
+
+
+def readSetup(inFilePath, inNamespaceMapping=None):
+    """
+    Reads the constraint setup of a file, one record at a time.
+
+    Args:
+        inFilePath (str): Path of the file.
+        inNamespaceMapping (dict): {source namespace: destination namespace} to remap the setup.
+
+    Yield:
+        SetupRecord: Setup of a constraint, with the namespaces remapped.
+    """
+    namespaceMapping = dict((source.rstrip(':'), destination.rstrip(':'))
+                            for source, destination in (inNamespaceMapping or {}).items())
+
+    with openSetupFile(inFilePath, 'r') as setupFile:
+        try:
+            header = json.loads(next(setupFile))
+        except (StopIteration, ValueError):
+            raise SetupFileError('{0} is not a constraint setup file'.format(inFilePath))
+
+        if header.get('format') != SETUP_FORMAT_NAME:
+            raise SetupFileError('{0} is not a constraint setup file'.format(inFilePath))
+
+        if header.get('version', 0) > SETUP_FORMAT_VERSION:
+            raise SetupFileError('{0} was written by a newer version ({1}) of the tool'.format(
+                                                                                inFilePath,
+                                                                                header.get('version')))
+
+        fieldList = header.get('fields', SETUP_RECORD_FIELDS)
+
+        for line in setupFile:
+            if not line.strip():
+                continue
+
+            setupRecord = SetupRecord(**dict(itertools.chain(((field, None) for field in SETUP_RECORD_FIELDS),
+                                                             zip(fieldList, json.loads(line)))))
+
+            yield setupRecord._replace(namespace=remapNamespace(setupRecord.namespace, namespaceMapping),
+                                       targets=[remapName(target, namespaceMapping)
+                                                for target in setupRecord.targets or []])
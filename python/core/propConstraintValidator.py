@@ -0,0 +1,273 @@
+"""
+Module created to validate the selection of the PropConstraint tool before the scene is modified.
+
+All the nodes the tool needs are checked with a single query to the scene, and every problem found is
+returned at once so it can be shown to the users before anything is deleted or constrained.
+
+A successful validation is kept until the scene changes, so an apply right after it does not query the scene
+again. Nodes added, removed, renamed or (dis)connected, scene loading, undo/redo and edits of ParentAttr on
+the validated controls invalidate it.
+"""
+import collections
+
+import maya.api.OpenMaya
+import maya.cmds
+
+import core.propConstraintCore
+
+# Events of Maya invalidating the cached validations.
+SCENE_CHANGE_EVENTS = ('SceneOpened',
+                       'NewSceneOpened',
+                       'NameChanged',
+                       'Undo',
+                       'Redo')
+
+# Kind of issues reported by the validator.
+ISSUE_NO_SELECTION = 'noSelection'
+ISSUE_NO_CONTROLS = 'noControls'
+ISSUE_MISSING_MAIN_POSITION_CTRL = 'missingMainPositionCtrl'
+ISSUE_MISSING_PARENT_ATTR_VALUE = 'missingParentAttrValue'
+ISSUE_MISSING_TARGET = 'missingTarget'
+
+ValidationIssue = collections.namedtuple('ValidationIssue', ['kind',
+                                                             'node',
+                                                             'message'])
+
+
+class PropConstraintValidationError(Exception):
+    """
+    Raised when the selection can not be applied, before the scene is modified.
+
+    Args:
+        inIssueList (list[ValidationIssue]): Problems found in the scene.
+    """
+
+    def __init__(self, inIssueList):
+        Exception.__init__(self, '\n'.join(issue.message for issue in inIssueList))
+        self.issueList = inIssueList
+
+
+class ValidationResult(object):
+    """
+    Result of the validation of a selection.
+
+    Args:
+        inIssueList (list[ValidationIssue]): Problems found in the scene.
+        inSpaceSwitchPlanList (list[tuple(ControlRecord, str, list[str])]): Controls, character
+                                                    namespace and targets to constrain them to.
+    """
+
+    def __init__(self, inIssueList, inSpaceSwitchPlanList):
+        self.issueList = inIssueList
+        self.spaceSwitchPlanList = inSpaceSwitchPlanList
+
+    @property
+    def isValid(self):
+        """
+        Gets if the selection can be applied.
+
+        Returns:
+            bool: True if there is not any issue, False otherwise.
+        """
+        return not self.issueList
+
+    @property
+    def spaceSwitchDataDict(self):
+        """
+        Gets the targets of the controls as used by PropConstraint.setSpaceSwitchDefaultPosition().
+
+        Returns:
+            dict: {prop control with namespace: [character target controls with namespace]}
+        """
+        spaceSwitchDataDict = {}
+        for controlRecord, _, targetList in self.spaceSwitchPlanList:
+            spaceSwitchDataDict.setdefault(controlRecord.fullName, targetList)
+        return spaceSwitchDataDict
+
+    def formatIssues(self):
+        """
+        Gets the issues as text to show them to the users.
+
+        Returns:
+            str: One issue per line.
+        """
+        return '\n'.join(issue.message for issue in self.issueList)
+
+
+class PropConstraintValidator(object):
+    """
+    Pre-flight validation of the selection of the OnPropConstraint Tool.
+
+    Args:
+        inPropConstraint (PropConstraint): Core instance used to discover the controls.
+    """
+
+    def __init__(self, inPropConstraint=None):
+        self.propConstraint = inPropConstraint or core.propConstraintCore.PropConstraint()
+        self.resultCache = {}
+        self.callbackIdList = []
+
+    def clearCache(self):
+        """
+        Forgets the previous validations, so the next one queries the scene, and stops listening to the scene.
+        """
+        self.resultCache.clear()
+        self.removeCallbacks()
+
+    def removeCallbacks(self):
+        """
+        Removes the callbacks watching the scene changes.
+        """
+        if self.callbackIdList:
+            maya.api.OpenMaya.MMessage.removeCallbacks(self.callbackIdList)
+            self.callbackIdList = []
+
+    def addCallbacks(self, inControlNameList):
+        """
+        Adds the callbacks invalidating the cached validations when the scene changes.
+
+        Args:
+            inControlNameList (list[str]): Validated controls, whose ParentAttr is watched.
+        """
+        self.removeCallbacks()
+
+        self.callbackIdList.append(maya.api.OpenMaya.MDGMessage.addNodeAddedCallback(self.onSceneChanged))
+        self.callbackIdList.append(maya.api.OpenMaya.MDGMessage.addNodeRemovedCallback(self.onSceneChanged))
+        self.callbackIdList.append(maya.api.OpenMaya.MDGMessage.addConnectionCallback(self.onSceneChanged))
+
+        for eventName in SCENE_CHANGE_EVENTS:
+            self.callbackIdList.append(maya.api.OpenMaya.MEventMessage.addEventCallback(eventName,
+                                                                                       self.onSceneChanged))
+
+        selectionList = maya.api.OpenMaya.MSelectionList()
+        for controlName in inControlNameList:
+            selectionList.add(controlName)
+
+        for index in range(selectionList.length()):
+            self.callbackIdList.append(maya.api.OpenMaya.MNodeMessage.addAttributeChangedCallback(
+                                                                        selectionList.getDependNode(index),
+                                                                        self.onAttributeChanged))
+
+    def onSceneChanged(self, *args):
+        """
+        Callback forgetting the previous validations.
+        """
+        self.resultCache.clear()
+
+    def onAttributeChanged(self, inMessage, inPlug, *args):
+        """
+        Callback forgetting the previous validations when the ParentAttr of a validated control changes.
+
+        Args:
+            inMessage (int): MNodeMessage.AttributeMessage flags.
+            inPlug (MPlug): Changed plug.
+        """
+        if not inMessage & maya.api.OpenMaya.MNodeMessage.kAttributeSet:
+            return
+
+        attributeName = maya.api.OpenMaya.MFnAttribute(inPlug.attribute()).name
+        if attributeName == core.propConstraintCore.DESIRED_CONTROL_ATTRIBUTE:
+            self.resultCache.clear()
+
+    def validate(self, inPropNamespaceList, inCharacterNamespaceList):
+        """
+        Checks every node needed to constrain the props to the characters, without modifying the scene.
+
+        Args:
+            inPropNamespaceList (list[str]): Namespaces of the props.
+            inCharacterNamespaceList (list[str]): Namespaces of the characters.
+
+        Returns:
+            ValidationResult: Issues found and the controls with their targets.
+        """
+        cacheKey = (tuple(inPropNamespaceList), tuple(inCharacterNamespaceList))
+
+        cachedResult = self.resultCache.get(cacheKey)
+        if cachedResult is not None:
+            return cachedResult
+
+        result = self.validateScene(inPropNamespaceList, inCharacterNamespaceList)
+
+        # Only the valid results are kept, a selection with issues is checked again once fixed.
+        self.clearCache()
+        if result.isValid:
+            self.resultCache[cacheKey] = result
+            self.addCallbacks(list(result.spaceSwitchDataDict))
+
+        return result
+
+    def validateScene(self, inPropNamespaceList, inCharacterNamespaceList):
+        """
+        Queries the scene to validate the selection.
+
+        Args:
+            inPropNamespaceList (list[str]): Namespaces of the props.
+            inCharacterNamespaceList (list[str]): Namespaces of the characters.
+
+        Returns:
+            ValidationResult: Issues found and the controls with their targets.
+        """
+        if not inPropNamespaceList or not inCharacterNamespaceList:
+            return ValidationResult([ValidationIssue(ISSUE_NO_SELECTION,
+                                                     None,
+                                                     'Select at least one character and one prop')],
+                                    [])
+
+        controlRecordList = list(self.propConstraint.iterSpaceSwitchCtrls(inPropNamespaceList))
+
+        mainPositionCtrlDict = collections.OrderedDict(
+                                    (namespace, '{0}:{1}'.format(namespace.strip(':'),
+                                                                 core.propConstraintCore.MAIN_POSITION_CTRL))
+                                    for namespace in list(inPropNamespaceList) + list(inCharacterNamespaceList))
+
+        requiredNodeSet = set(mainPositionCtrlDict.values())
+        for controlRecord in controlRecordList:
+            for objectNameSpace in inCharacterNamespaceList:
+                requiredNodeSet.add('{0}{1}'.format(objectNameSpace, controlRecord.name))
+                requiredNodeSet.add('{0}{1}'.format(objectNameSpace, controlRecord.value))
+
+        # Single query for all the nodes of the selection.
+        existingNodeSet = set(maya.cmds.ls(list(requiredNodeSet)) or [])
+
+        issueList = []
+
+        namespacesWithControls = set(controlRecord.namespace for controlRecord in controlRecordList)
+        for namespace in inPropNamespaceList:
+            if namespace.strip(':') not in namespacesWithControls:
+                issueList.append(ValidationIssue(ISSUE_NO_CONTROLS,
+                                                 namespace,
+                                                 'No control with {0} found in {1}'.format(
+                                                            core.propConstraintCore.DESIRED_CONTROL_ATTRIBUTE,
+                                                            namespace)))
+
+        for mainPositionCtrl in mainPositionCtrlDict.values():
+            if mainPositionCtrl not in existingNodeSet:
+                issueList.append(ValidationIssue(ISSUE_MISSING_MAIN_POSITION_CTRL,
+                                                 mainPositionCtrl,
+                                                 'No Found {0}'.format(mainPositionCtrl)))
+
+        for controlRecord in controlRecordList:
+            if not controlRecord.value:
+                issueList.append(ValidationIssue(ISSUE_MISSING_PARENT_ATTR_VALUE,
+                                                 controlRecord.fullName,
+                                                 '{0}.{1} is empty'.format(
+                                                            controlRecord.fullName,
+                                                            core.propConstraintCore.DESIRED_CONTROL_ATTRIBUTE)))
+
+        spaceSwitchPlanList = list(core.propConstraintCore.iterSpaceSwitchTargets(controlRecordList,
+                                                                                  inCharacterNamespaceList,
+                                                                                  existingNodeSet.__contains__))
+
+        for controlRecord, objectNameSpace, targetList in spaceSwitchPlanList:
+            if existingNodeSet.issuperset(targetList):
+                continue
+
+            issueList.append(ValidationIssue(ISSUE_MISSING_TARGET,
+                                             controlRecord.fullName,
+                                             'No Found {0}{1} or {0}{2}, target of {3}'.format(
+                                                                                objectNameSpace,
+                                                                                controlRecord.name,
+                                                                                controlRecord.value,
+                                                                                controlRecord.fullName)))
+
+        return ValidationResult(issueList, spaceSwitchPlanList)
@@ -0,0 +1,474 @@
+"""
+Module created to share the rig metadata lookups of the PropConstraint tool between the Maya sessions of a machine.
+
+The cache is a local daemon listening on a Unix socket, it never uses the network. It only holds what the rig
+files define, the names of their space switch controls, the ParentAttr values are scene state and always
+read from the scene. The socket lives in a
+directory only readable by the user ($XDG_RUNTIME_DIR when available) and the clients refuse sockets owned
+by other users. The messages are JSON lines:
+    {"op": "get", "key": key}                 ->  {"ok": true, "value": metadata or null}
+    {"op": "set", "key": key, "value": value} ->  {"ok": true}
+
+Run the daemon with:
+    python rigMetadataCache.py [socketPath]
+"""
+import collections
+import json
+import os
+import socket
+import stat
+import sys
+import tempfile
+import threading
+import timeit
+
+try:
+    import socketserver
+except ImportError:
+    import SocketServer as socketserver
+
+SOCKET_FILE_NAME = 'propConstraintRigMetadata.sock'
+
+# Seconds the client waits for the daemon before falling back to the scene.
+DEFAULT_CLIENT_TIMEOUT = 0.1
+
+# Seconds the client waits before trying to reach a daemon that did not answer.
+DEFAULT_RETRY_DELAY = 30.0
+
+MAX_CACHE_ENTRIES = 4096
+
+# Version of the rig metadata, the entries of other versions are ignored and replaced.
+RIG_METADATA_VERSION = 2
+
+
+class RigMetadataCacheError(Exception):
+    """
+    Raised when the rig metadata daemon can not be started.
+    """
+
+
+def isPrivatePath(inPath):
+    """
+    Gets if a path is owned by the current user and can not be accessed by the other users.
+
+    Args:
+        inPath (str): Path to check.
+
+    Returns:
+        bool: True if the path is private to the user, False otherwise.
+    """
+    try:
+        pathStat = os.lstat(inPath)
+    except OSError:
+        return False
+
+    return pathStat.st_uid == os.getuid() and not pathStat.st_mode & (stat.S_IRWXG | stat.S_IRWXO)
+
+
+def getSocketDirectory(inCreate=False):
+    """
+    Gets the directory of the daemon socket, private to the current user.
+
+    Args:
+        inCreate (bool): True to create the directory when it does not exist.
+
+    Returns:
+        str: Path of the directory, None if there is not any private directory available.
+    """
+    runtimeDirectory = os.environ.get('XDG_RUNTIME_DIR')
+    if runtimeDirectory and isPrivatePath(runtimeDirectory):
+        return runtimeDirectory
+
+    socketDirectory = os.path.join(tempfile.gettempdir(), 'propConstraint-{0}'.format(os.getuid()))
+
+    if inCreate and not os.path.lexists(socketDirectory):
+        try:
+            os.mkdir(socketDirectory, 0o700)
+        except OSError:
+            return None
+
+    # Another user could have created the directory before us.
+    if not isPrivatePath(socketDirectory):
+        return None
+
+    return socketDirectory
+
+
+def getDefaultSocketPath(inCreate=False):
+    """
+    Gets the path of the daemon socket of the current user.
+
+    Args:
+        inCreate (bool): True to create its directory when it does not exist.
+
+    Returns:
+        str: Path of the socket, None if there is not any private directory available.
+    """
+    socketDirectory = getSocketDirectory(inCreate)
+    if socketDirectory is None:
+        return None
+
+    return os.path.join(socketDirectory, SOCKET_FILE_NAME)
+
+
+def getRigFileKey(inFilePath):
+    """
+    Gets the cache key of a rig file, made of its normalised path, modification time and size.
+
+    Only the file status is read, so the key can be computed on the UI thread.
+
+    Args:
+        inFilePath (str): Path of the rig file.
+
+    Returns:
+        str: Key of the rig, None if the file can not be found.
+    """
+    try:
+        fileStat = os.stat(inFilePath)
+    except (OSError, TypeError):
+        return None
+
+    return '{0}@{1!r}@{2}'.format(os.path.normcase(os.path.normpath(inFilePath)),
+                                  fileStat.st_mtime,
+                                  fileStat.st_size)
+
+
+def getRigMetadata(inControlNameList):
+    """
+    Gets the metadata of a rig to store in the daemon, made only of what the rig file defines.
+
+    Args:
+        inControlNameList (list[str]): Space switch controls of the rig, without namespace.
+
+    Returns:
+        dict: Metadata of the rig.
+    """
+    return {'version': RIG_METADATA_VERSION,
+            'controls': list(inControlNameList)}
+
+
+def getControlNames(inRigMetadata):
+    """
+    Gets the space switch controls of a rig from its metadata.
+
+    Args:
+        inRigMetadata (dict): Metadata of the rig, see getRigMetadata().
+
+    Returns:
+        list[str]: Controls without namespace, None if there is not any metadata or it is from another version.
+    """
+    if not isinstance(inRigMetadata, dict) or inRigMetadata.get('version') != RIG_METADATA_VERSION:
+        return None
+
+    return inRigMetadata.get('controls')
+
+
+class RigMetadataRequestHandler(socketserver.StreamRequestHandler):
+    """
+    Answers the requests of a client connection until the client closes it.
+    """
+
+    def handle(self):
+        for line in iter(self.rfile.readline, b''):
+            try:
+                request = json.loads(line.decode('utf-8'))
+                response = self.server.processRequest(request)
+            except (ValueError, KeyError, TypeError, AttributeError):
+                response = {'ok': False}
+
+            self.wfile.write((json.dumps(response) + '\n').encode('utf-8'))
+            self.wfile.flush()
+
+
+class RigMetadataCacheServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    Local daemon holding the rig metadata, keyed by rig file.
+
+    It can also be started in a thread of the current process, as a stand-in of the daemon.
+
+    Args:
+        inSocketPath (str): Path of the Unix socket to listen on, the default socket of the user if None.
+    """
+    daemon_threads = True
+
+    def __init__(self, inSocketPath=None):
+        socketPath = inSocketPath or getDefaultSocketPath(inCreate=True)
+        if socketPath is None:
+            raise RigMetadataCacheError('There is not any private directory for the socket')
+
+        self.removeStaleSocket(socketPath)
+
+        socketserver.UnixStreamServer.__init__(self, socketPath, RigMetadataRequestHandler)
+        os.chmod(socketPath, 0o600)
+
+        self.socketPath = socketPath
+        self.metadataDict = collections.OrderedDict()
+        self.lock = threading.Lock()
+        self.connectionSet = set()
+        self.thread = None
+
+    @staticmethod
+    def removeStaleSocket(inSocketPath):
+        """
+        Removes the socket left by a daemon that is not running anymore.
+
+        Args:
+            inSocketPath (str): Path of the socket.
+
+        Raises:
+            RigMetadataCacheError: If a daemon is listening on the socket or the path is not our socket.
+        """
+        if not os.path.lexists(inSocketPath):
+            return
+
+        socketStat = os.lstat(inSocketPath)
+        if not stat.S_ISSOCK(socketStat.st_mode) or socketStat.st_uid != os.getuid():
+            raise RigMetadataCacheError('{0} is not a socket of the current user'.format(inSocketPath))
+
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            connection.connect(inSocketPath)
+        except (socket.error, OSError):
+            os.remove(inSocketPath)
+            return
+        finally:
+            connection.close()
+
+        raise RigMetadataCacheError('A daemon is already listening on {0}'.format(inSocketPath))
+
+    def process_request(self, request, client_address):
+        with self.lock:
+            self.connectionSet.add(request)
+        socketserver.ThreadingMixIn.process_request(self, request, client_address)
+
+    def shutdown_request(self, request):
+        with self.lock:
+            self.connectionSet.discard(request)
+        socketserver.UnixStreamServer.shutdown_request(self, request)
+
+    def processRequest(self, inRequest):
+        """
+        Processes a request of a client.
+
+        Args:
+            inRequest (dict): Request sent by the client.
+
+        Returns:
+            dict: Response to send back.
+        """
+        with self.lock:
+            if inRequest['op'] == 'get':
+                value = self.metadataDict.pop(inRequest['key'], None)
+                if value is not None:
+                    # Most recently used entries are kept at the end.
+                    self.metadataDict[inRequest['key']] = value
+                return {'ok': True, 'value': value}
+
+            if inRequest['op'] == 'set':
+                self.metadataDict.pop(inRequest['key'], None)
+                self.metadataDict[inRequest['key']] = inRequest['value']
+                while len(self.metadataDict) > MAX_CACHE_ENTRIES:
+                    self.metadataDict.popitem(last=False)
+                return {'ok': True}
+
+        return {'ok': False}
+
+    def startInThread(self):
+        """
+        Serves the requests in a daemon thread of the current process.
+
+        Returns:
+            RigMetadataCacheServer: The server itself.
+        """
+        self.thread = threading.Thread(target=self.serve_forever)
+        self.thread.daemon = True
+        self.thread.start()
+        return self
+
+    def stop(self):
+        """
+        Stops serving, closes the connections of the clients and removes the socket.
+        """
+        if self.thread is not None:
+            self.shutdown()
+            self.thread.join()
+            self.thread = None
+
+        with self.lock:
+            connectionList = list(self.connectionSet)
+            self.connectionSet.clear()
+
+        for connection in connectionList:
+            try:
+                connection.shutdown(socket.SHUT_RDWR)
+            except (socket.error, OSError):
+                pass
+
+        self.server_close()
+        if os.path.lexists(self.socketPath):
+            os.remove(self.socketPath)
+
+
+class RigMetadataCacheClient(object):
+    """
+    Client of the rig metadata daemon, it reuses a single connection and never waits longer than its timeout.
+
+    Any failure makes the lookups return None, so the caller falls back to the scene.
+
+    Args:
+        inSocketPath (str): Path of the Unix socket of the daemon, the default socket of the user if None.
+        inTimeout (float): Seconds to wait for the daemon on each request.
+        inRetryDelay (float): Seconds to wait before connecting again after a failure.
+    """
+
+    def __init__(self,
+                 inSocketPath=None,
+                 inTimeout=DEFAULT_CLIENT_TIMEOUT,
+                 inRetryDelay=DEFAULT_RETRY_DELAY):
+        self.socketPath = inSocketPath
+        self.timeout = inTimeout
+        self.retryDelay = inRetryDelay
+
+        self.connection = None
+        self.connectionFile = None
+        self.lastFailureTime = None
+
+    def isTrustedSocket(self, inSocketPath):
+        """
+        Gets if the socket was created by the current user in a directory of its own.
+
+        Args:
+            inSocketPath (str): Path of the socket.
+
+        Returns:
+            bool: True if the socket can be trusted, False otherwise.
+        """
+        try:
+            socketStat = os.lstat(inSocketPath)
+            directoryStat = os.stat(os.path.dirname(inSocketPath) or '.')
+        except OSError:
+            return False
+
+        userId = os.getuid()
+        return stat.S_ISSOCK(socketStat.st_mode) and socketStat.st_uid == userId \
+            and directoryStat.st_uid == userId and not directoryStat.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+
+    def connect(self):
+        """
+        Connects to the daemon if the client is not connected yet.
+
+        Returns:
+            bool: True if the client is connected, False otherwise.
+        """
+        if self.connection is not None:
+            return True
+
+        if not hasattr(socket, 'AF_UNIX'):
+            return False
+
+        if self.lastFailureTime is not None and timeit.default_timer() - self.lastFailureTime < self.retryDelay:
+            return False
+
+        socketPath = self.socketPath or getDefaultSocketPath()
+        if socketPath is None or not self.isTrustedSocket(socketPath):
+            return False
+
+        try:
+            connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            connection.settimeout(self.timeout)
+            connection.connect(socketPath)
+        except (socket.error, OSError):
+            self.lastFailureTime = timeit.default_timer()
+            return False
+
+        self.connection = connection
+        self.connectionFile = connection.makefile('rb')
+        return True
+
+    def close(self):
+        """
+        Closes the connection with the daemon.
+        """
+        if self.connectionFile is not None:
+            self.connectionFile.close()
+            self.connectionFile = None
+
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+    def sendRequest(self, inRequest):
+        """
+        Sends a request to the daemon and waits for its response.
+
+        Args:
+            inRequest (dict): Request to send.
+
+        Returns:
+            dict: Response of the daemon, None if it could not be reached in time.
+        """
+        if not self.connect():
+            return None
+
+        try:
+            self.connection.sendall((json.dumps(inRequest) + '\n').encode('utf-8'))
+            responseLine = self.connectionFile.readline()
+            if not responseLine:
+                raise ValueError('The daemon closed the connection')
+            response = json.loads(responseLine.decode('utf-8'))
+        except (socket.error, OSError, ValueError):
+            self.lastFailureTime = timeit.default_timer()
+            self.close()
+            return None
+
+        if not response.get('ok'):
+            return None
+
+        return response
+
+    def getMetadata(self, inRigKey):
+        """
+        Gets the metadata of a rig from the daemon.
+
+        Args:
+            inRigKey (str): Key of the rig, see getRigFileKey().
+
+        Returns:
+            dict: Metadata of the rig, None if it is not cached or the daemon can not be reached.
+        """
+        if not inRigKey:
+            return None
+
+        response = self.sendRequest({'op': 'get', 'key': inRigKey})
+        if response is None:
+            return None
+
+        return response.get('value')
+
+    def setMetadata(self, inRigKey, inMetadataDict):
+        """
+        Stores the metadata of a rig in the daemon.
+
+        Args:
+            inRigKey (str): Key of the rig, see getRigFileKey().
+            inMetadataDict (dict): Metadata of the rig.
+
+        Returns:
+            bool: True if the daemon stored the metadata, False otherwise.
+        """
+        if not inRigKey:
+            return False
+
+        return self.sendRequest({'op': 'set', 'key': inRigKey, 'value': inMetadataDict}) is not None
+
+
+if __name__ == '__main__':
+    server = RigMetadataCacheServer(sys.argv[1] if len(sys.argv) > 1 else None)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if os.path.lexists(server.socketPath):
+            os.remove(server.socketPath)
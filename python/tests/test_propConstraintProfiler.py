@@ -0,0 +1,91 @@
+import unittest
+
+import core.propConstraintProfiler
+
+
+class TestFindIssues(unittest.TestCase):
+
+    def test_cleanSetupHasNoIssues(self):
+        scene = core.propConstraintProfiler.StandInConstraintScene.fromSetupSize(2)
+
+        issueList = core.propConstraintProfiler.ConstraintProfiler.findIssues(scene.constraintRecordList)
+
+        self.assertEqual(issueList, [])
+
+    def test_stackedConstraints(self):
+        scene = core.propConstraintProfiler.StandInConstraintScene.fromSetupSize(2, inStackedCount=1)
+
+        issueList = core.propConstraintProfiler.ConstraintProfiler.findIssues(scene.constraintRecordList)
+
+        self.assertEqual([issue.kind for issue in issueList],
+                         [core.propConstraintProfiler.ISSUE_STACKED_CONSTRAINTS])
+        self.assertEqual(issueList[0].control, 'prp_standIn_000:control_00_ctrl')
+        self.assertEqual(issueList[0].constraints,
+                         ('prp_standIn_000:control_00_ctrl_parentConstraint1',
+                          'prp_standIn_000:control_00_ctrl_pointConstraint1'))
+
+    def test_skipAllAxesConstraint(self):
+        scene = core.propConstraintProfiler.StandInConstraintScene.fromSetupSize(1, inSkipAllAxesCount=1)
+
+        issueList = core.propConstraintProfiler.ConstraintProfiler.findIssues(scene.constraintRecordList)
+
+        self.assertEqual(sorted(issue.kind for issue in issueList),
+                         [core.propConstraintProfiler.ISSUE_SKIP_ALL_AXES,
+                          core.propConstraintProfiler.ISSUE_STACKED_CONSTRAINTS])
+
+        skipIssue = [issue for issue in issueList
+                     if issue.kind == core.propConstraintProfiler.ISSUE_SKIP_ALL_AXES][0]
+        self.assertEqual(skipIssue.constraints, ('prp_standIn_000:control_00_ctrl_orientConstraint1',))
+
+
+class TestProfileRanking(unittest.TestCase):
+
+    def setUp(self):
+        constraintRecord = core.propConstraintProfiler.ConstraintRecord
+        axes = core.propConstraintProfiler.STAND_IN_AXES
+
+        self.scene = core.propConstraintProfiler.StandInConstraintScene([
+            constraintRecord('cheap', 'pointConstraint', 'prpA', 'prpA:a_ctrl', ('chr:hand',), axes, ()),
+            constraintRecord('expensive', 'parentConstraint', 'prpB', 'prpB:b_ctrl', ('chr:hand', 'chr:hip'),
+                             axes, axes),
+            constraintRecord('medium', 'parentConstraint', 'prpA', 'prpA:c_ctrl', ('chr:hand',), axes, axes),
+        ])
+        self.profiler = core.propConstraintProfiler.ConstraintProfiler(self.scene, self.scene.timer)
+
+    def test_rankedNodes(self):
+        report = self.profiler.profile(1, 10)
+
+        self.assertEqual(report.frameCount, 10)
+        self.assertEqual([constraintRecord.name for constraintRecord, _ in report.rankedNodes()],
+                         ['expensive', 'medium', 'cheap'])
+        self.assertAlmostEqual(report.nodeTimings['cheap'], 10 * 3 * core.propConstraintProfiler.STAND_IN_AXIS_COST)
+
+    def test_callCostIsNotCharged(self):
+        scene = core.propConstraintProfiler.StandInConstraintScene(self.scene.constraintRecordList, inCallCost=1.0)
+
+        report = core.propConstraintProfiler.ConstraintProfiler(scene, scene.timer).profile(1, 10)
+
+        self.assertAlmostEqual(report.nodeTimings['cheap'], 10 * 3 * core.propConstraintProfiler.STAND_IN_AXIS_COST)
+        self.assertAlmostEqual(report.nodeTimings['expensive'],
+                               10 * 12 * core.propConstraintProfiler.STAND_IN_AXIS_COST)
+
+    def test_rankedNamespaces(self):
+        report = self.profiler.profile(1, 10)
+
+        self.assertEqual([namespace for namespace, _ in report.rankedNamespaces()], ['prpB', 'prpA'])
+        self.assertAlmostEqual(report.totalTime, sum(report.namespaceTimings.values()))
+
+    def test_namespaceFilter(self):
+        report = self.profiler.profile(1, 2, ['prpA:'])
+
+        self.assertEqual(sorted(report.nodeTimings), ['cheap', 'medium'])
+
+    def test_reportFormats(self):
+        report = self.profiler.profile(1, 2)
+
+        self.assertEqual(report.toDict()['nodes'][0]['name'], 'expensive')
+        self.assertIn('expensive -> prpB:b_ctrl', report.formatReport())
+
+
+if __name__ == '__main__':
+    unittest.main()
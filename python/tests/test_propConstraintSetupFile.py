@@ -0,0 +1,120 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+import core.propConstraintSetupFile
+
+
+class TestRemapNamespace(unittest.TestCase):
+
+    def test_notMappedNamespace(self):
+        self.assertEqual(core.propConstraintSetupFile.remapNamespace('prp_a', {'prp_b': 'prp_c'}), 'prp_a')
+        self.assertEqual(core.propConstraintSetupFile.remapNamespace('prp_a', None), 'prp_a')
+        self.assertEqual(core.propConstraintSetupFile.remapNamespace('', {'prp_a': 'prp_c'}), '')
+
+    def test_leadingNamespaceIsRemapped(self):
+        self.assertEqual(core.propConstraintSetupFile.remapNamespace('chr_a:sub', {'chr_a': 'chr_b'}), 'chr_b:sub')
+
+    def test_innerNamespaceIsNotRemapped(self):
+        self.assertEqual(core.propConstraintSetupFile.remapNamespace('chr_a:sub', {'sub': 'other'}), 'chr_a:sub')
+
+    def test_longestMappingWins(self):
+        namespaceMapping = {'chr_a': 'chr_b', 'chr_a:sub': 'chr_c:sub2'}
+
+        self.assertEqual(core.propConstraintSetupFile.remapNamespace('chr_a:sub', namespaceMapping), 'chr_c:sub2')
+        self.assertEqual(core.propConstraintSetupFile.remapNamespace('chr_a:other', namespaceMapping),
+                         'chr_b:other')
+
+    def test_emptyDestinationRemovesNamespace(self):
+        self.assertEqual(core.propConstraintSetupFile.remapNamespace('chr_a:sub', {'chr_a': ''}), 'sub')
+        self.assertEqual(core.propConstraintSetupFile.remapName('chr_a:hand_ctrl', {'chr_a': ''}), 'hand_ctrl')
+
+    def test_remapName(self):
+        namespaceMapping = {'chr_a': 'chr_b'}
+
+        self.assertEqual(core.propConstraintSetupFile.remapName('chr_a:sub:hand_ctrl', namespaceMapping),
+                         'chr_b:sub:hand_ctrl')
+        self.assertEqual(core.propConstraintSetupFile.remapName('hand_ctrl', namespaceMapping), 'hand_ctrl')
+
+
+class TestSetupFile(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.setupRecordList = [
+            core.propConstraintSetupFile.SetupRecord('prp_a',
+                                                     'handle_ctrl',
+                                                     'parentConstraint',
+                                                     ['chr_a:hand_ctrl', 'chr_a:sub:grip_ctrl'],
+                                                     ['y'],
+                                                     [],
+                                                     [0.0, 1.0, 0.0, 0.0, 0.0, 90.0] * 2,
+                                                     '/poses/handle.pose'),
+            core.propConstraintSetupFile.SetupRecord('prp_b',
+                                                     'root_ctrl',
+                                                     'orientConstraint',
+                                                     ['chr_b:hand_ctrl'],
+                                                     [],
+                                                     ['x', 'z'],
+                                                     [0.0, 0.0, 45.0],
+                                                     None)]
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def writeLines(self, inLineList):
+        filePath = os.path.join(self.directory, 'setup.jsonl')
+        with open(filePath, 'w') as setupFile:
+            setupFile.write('\n'.join(inLineList) + '\n')
+        return filePath
+
+    def test_roundTrip(self):
+        for fileName in ('setup.jsonl', 'setup.jsonl.gz'):
+            filePath = os.path.join(self.directory, fileName)
+
+            self.assertEqual(core.propConstraintSetupFile.writeSetup(filePath, iter(self.setupRecordList)), 2)
+            self.assertEqual(list(core.propConstraintSetupFile.readSetup(filePath)), self.setupRecordList)
+
+    def test_readWithNamespaceMapping(self):
+        filePath = os.path.join(self.directory, 'setup.jsonl')
+        core.propConstraintSetupFile.writeSetup(filePath, self.setupRecordList)
+
+        setupRecordList = list(core.propConstraintSetupFile.readSetup(filePath, {'prp_a:': 'prp_c:',
+                                                                                 'chr_a': 'chr_c',
+                                                                                 'chr_a:sub': 'chr_d'}))
+
+        self.assertEqual(setupRecordList[0].namespace, 'prp_c')
+        self.assertEqual(setupRecordList[0].targets, ['chr_c:hand_ctrl', 'chr_d:grip_ctrl'])
+        self.assertEqual(setupRecordList[1], self.setupRecordList[1])
+
+    def test_missingFieldsAreNone(self):
+        filePath = self.writeLines([json.dumps({'format': core.propConstraintSetupFile.SETUP_FORMAT_NAME,
+                                                'version': 1,
+                                                'fields': ['namespace', 'control', 'type', 'targets']}),
+                                    json.dumps(['prp_a', 'handle_ctrl', 'pointConstraint', ['chr_a:hand_ctrl']])])
+
+        setupRecord, = core.propConstraintSetupFile.readSetup(filePath)
+
+        self.assertEqual(setupRecord.type, 'pointConstraint')
+        self.assertIsNone(setupRecord.offsets)
+        self.assertIsNone(setupRecord.pose)
+
+    def test_notASetupFile(self):
+        for lineList in ([], ['not json'], [json.dumps({'format': 'otherFormat'})]):
+            filePath = self.writeLines(lineList)
+
+            with self.assertRaises(core.propConstraintSetupFile.SetupFileError):
+                list(core.propConstraintSetupFile.readSetup(filePath))
+
+    def test_newerVersion(self):
+        filePath = self.writeLines([json.dumps({'format': core.propConstraintSetupFile.SETUP_FORMAT_NAME,
+                                                'version': core.propConstraintSetupFile.SETUP_FORMAT_VERSION + 1})])
+
+        with self.assertRaises(core.propConstraintSetupFile.SetupFileError):
+            list(core.propConstraintSetupFile.readSetup(filePath))
+
+
+if __name__ == '__main__':
+    unittest.main()
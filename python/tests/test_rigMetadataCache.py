@@ -0,0 +1,199 @@
+import json
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import timeit
+import unittest
+
+import core.rigMetadataCache
+
+
+class RigMetadataCacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.socketPath = os.path.join(self.directory, core.rigMetadataCache.SOCKET_FILE_NAME)
+        self.clientList = []
+
+    def tearDown(self):
+        for client in self.clientList:
+            client.close()
+        shutil.rmtree(self.directory)
+
+    def createClient(self, **kwargs):
+        client = core.rigMetadataCache.RigMetadataCacheClient(self.socketPath, **kwargs)
+        self.clientList.append(client)
+        return client
+
+
+class TestRigMetadataCacheServer(RigMetadataCacheTestCase):
+
+    def setUp(self):
+        super(TestRigMetadataCacheServer, self).setUp()
+        self.server = core.rigMetadataCache.RigMetadataCacheServer(self.socketPath).startInThread()
+
+    def tearDown(self):
+        self.server.stop()
+        super(TestRigMetadataCacheServer, self).tearDown()
+
+    def test_socketIsPrivate(self):
+        self.assertEqual(os.stat(self.socketPath).st_mode & 0o777, 0o600)
+
+    def test_setAndGetMetadata(self):
+        client = self.createClient()
+
+        self.assertIsNone(client.getMetadata('rig@1@2'))
+        self.assertTrue(client.setMetadata('rig@1@2', {'controls': [['hand_ctrl', 'grip_ctrl']]}))
+        self.assertEqual(client.getMetadata('rig@1@2'), {'controls': [['hand_ctrl', 'grip_ctrl']]})
+
+    def test_metadataIsSharedBetweenClients(self):
+        self.createClient().setMetadata('rig@1@2', {'controls': ['hand_ctrl']})
+
+        self.assertEqual(self.createClient().getMetadata('rig@1@2'), {'controls': ['hand_ctrl']})
+
+    def test_connectionIsReused(self):
+        client = self.createClient()
+        client.getMetadata('rig@1@2')
+        connection = client.connection
+
+        client.getMetadata('rig@1@2')
+
+        self.assertIs(client.connection, connection)
+
+    def test_stopClosesOpenConnections(self):
+        client = self.createClient()
+        client.setMetadata('rig@1@2', {'a': 1})
+
+        self.server.stop()
+
+        self.assertIsNone(client.getMetadata('rig@1@2'))
+        self.assertFalse(os.path.exists(self.socketPath))
+
+    def test_liveSocketIsNotReplaced(self):
+        with self.assertRaises(core.rigMetadataCache.RigMetadataCacheError):
+            core.rigMetadataCache.RigMetadataCacheServer(self.socketPath)
+
+        self.assertEqual(self.createClient().setMetadata('rig@1@2', {}), True)
+
+
+class TestRigMetadataCacheClient(RigMetadataCacheTestCase):
+
+    def test_missingDaemon(self):
+        self.assertIsNone(self.createClient().getMetadata('rig@1@2'))
+
+    def test_staleSocketIsReplaced(self):
+        staleSocket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        staleSocket.bind(self.socketPath)
+        staleSocket.close()
+
+        server = core.rigMetadataCache.RigMetadataCacheServer(self.socketPath).startInThread()
+        try:
+            self.assertTrue(self.createClient().setMetadata('rig@1@2', {}))
+        finally:
+            server.stop()
+
+    def test_timeoutAndBackOff(self):
+        # Daemon stand-in accepting the connections without ever answering.
+        silentServer = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        silentServer.bind(self.socketPath)
+        silentServer.listen(5)
+        acceptedList = []
+
+        def acceptConnections():
+            while True:
+                try:
+                    acceptedList.append(silentServer.accept()[0])
+                except (socket.error, OSError):
+                    return
+
+        acceptThread = threading.Thread(target=acceptConnections)
+        acceptThread.daemon = True
+        acceptThread.start()
+
+        try:
+            client = self.createClient(inTimeout=0.05, inRetryDelay=60.0)
+
+            startTime = timeit.default_timer()
+            self.assertIsNone(client.getMetadata('rig@1@2'))
+            self.assertLess(timeit.default_timer() - startTime, 1.0)
+            self.assertEqual(len(acceptedList), 1)
+
+            # The client does not try again until the retry delay is over.
+            self.assertIsNone(client.getMetadata('rig@1@2'))
+            self.assertIsNone(client.connection)
+            self.assertEqual(len(acceptedList), 1)
+        finally:
+            silentServer.close()
+            for connection in acceptedList:
+                connection.close()
+
+    def test_untrustedSocketDirectory(self):
+        server = core.rigMetadataCache.RigMetadataCacheServer(self.socketPath).startInThread()
+        try:
+            os.chmod(self.directory, 0o777)
+            self.assertIsNone(self.createClient().getMetadata('rig@1@2'))
+            self.assertIsNone(self.clientList[-1].connection)
+        finally:
+            os.chmod(self.directory, 0o700)
+            server.stop()
+
+
+class TestRigMetadata(RigMetadataCacheTestCase):
+
+    def setUp(self):
+        super(TestRigMetadata, self).setUp()
+        self.server = core.rigMetadataCache.RigMetadataCacheServer(self.socketPath).startInThread()
+
+    def tearDown(self):
+        self.server.stop()
+        super(TestRigMetadata, self).tearDown()
+
+    def test_sameKeyWithChangedValue(self):
+        sceneValueDict = {'hand_ctrl': 'grip_ctrl'}
+        self.createClient().setMetadata('rig@1@2', core.rigMetadataCache.getRigMetadata(list(sceneValueDict)))
+
+        # The artist edits ParentAttr, the rig file and so its key do not change.
+        sceneValueDict['hand_ctrl'] = 'palm_ctrl'
+        rigMetadata = self.createClient().getMetadata('rig@1@2')
+
+        self.assertNotIn('grip_ctrl', json.dumps(rigMetadata))
+
+        controlNameList = core.rigMetadataCache.getControlNames(rigMetadata)
+        self.assertEqual(controlNameList, ['hand_ctrl'])
+        self.assertEqual([sceneValueDict[controlName] for controlName in controlNameList], ['palm_ctrl'])
+
+    def test_metadataOfOtherVersionIsIgnored(self):
+        client = self.createClient()
+        client.setMetadata('rig@1@2', {'controls': [['hand_ctrl', 'grip_ctrl']]})
+
+        self.assertIsNone(core.rigMetadataCache.getControlNames(client.getMetadata('rig@1@2')))
+        self.assertIsNone(core.rigMetadataCache.getControlNames(client.getMetadata('rig@3@4')))
+
+
+class TestRigFileKey(unittest.TestCase):
+
+    def test_keyChangesWithTheFile(self):
+        fileDescriptor, filePath = tempfile.mkstemp()
+        os.close(fileDescriptor)
+        try:
+            os.utime(filePath, (1000, 1000))
+            firstKey = core.rigMetadataCache.getRigFileKey(filePath)
+            self.assertEqual(firstKey, core.rigMetadataCache.getRigFileKey(filePath))
+
+            with open(filePath, 'w') as rigFile:
+                rigFile.write('rig')
+            os.utime(filePath, (1000, 1000))
+
+            self.assertNotEqual(firstKey, core.rigMetadataCache.getRigFileKey(filePath))
+        finally:
+            os.remove(filePath)
+
+    def test_missingFile(self):
+        self.assertIsNone(core.rigMetadataCache.getRigFileKey('/not/a/rig.ma'))
+        self.assertIsNone(core.rigMetadataCache.getRigFileKey(None))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,6 +3,7 @@ import PySide2.QtGui
 import PySide2.QtCore
 
 import core.propConstraintCore
+import core.propConstraintValidator
 import constants
 import propPoseSelector
 import maya.api.OpenMaya
@@ -28,11 +29,23 @@ class PropConstraintMainWindow(PySide2.QtWidgets.QMainWindow):
 
         self.setWindowTitle(inMainToolNameStr)
 
+        # Instance of the Core class, shared by the slots so the validation can be reused on apply.
+        self.propConstraint = core.propConstraintCore.PropConstraint()
+        self.propConstraintValidator = core.propConstraintValidator.PropConstraintValidator(self.propConstraint)
+
         self.initCentralWidget()
 
         # Main Signal
+        self.ValidateButton.clicked.connect(self.validateSelection)
         self.ApplyConstraintButton.clicked.connect(self.applyConstraint)
 
+    def closeEvent(self, event):
+        """
+        Removes the scene callbacks of the validator when the tool is closed.
+        """
+        self.propConstraintValidator.clearCache()
+        super(PropConstraintMainWindow, self).closeEvent(event)
+
     def initCentralWidget(self):
         """
         Main Initializer method for the tool, where all the widgets are called to build
@@ -59,6 +72,8 @@ class PropConstraintMainWindow(PySide2.QtWidgets.QMainWindow):
 
         self.propPoseSelector = propPoseSelector.PoseSelector()
 
+        self.ValidateButton = PySide2.QtWidgets.QPushButton("Check Scene")
+
         self.ApplyConstraintButton = PySide2.QtWidgets.QPushButton("Create Constraint!")
 
 
@@ -69,6 +84,7 @@ class PropConstraintMainWindow(PySide2.QtWidgets.QMainWindow):
         mainLayout.addWidget(self.constraintTypeSelector)
         mainLayout.addWidget(self.propPoseSelector)
 
+        mainLayout.addWidget(self.ValidateButton)
         mainLayout.addWidget(self.ApplyConstraintButton)
 
         self.setCentralWidget(mainWidget)
@@ -87,6 +103,44 @@ class PropConstraintMainWindow(PySide2.QtWidgets.QMainWindow):
         """
         return [listWidgetItem.text() for listWidgetItem in self.propSelector.itemsSelectedInList]
 
+    def getSelectedNameSpaces(self):
+        """
+        Get the namespaces of the characters and props selected in the UI.
+
+        Returns:
+             tuple(list[str], list[str]): character and prop namespaces, ending with ':'.
+        """
+        characterNameSpaceList = ['{0}:'.format(listWidgetItem.text()) for listWidgetItem in
+                                  self.characterSelector.itemsSelectedInList]
+
+        propNameSpaceList = ['{0}:'.format(listWidgetItem.text()) for listWidgetItem in
+                             self.propSelector.itemsSelectedInList]
+
+        return characterNameSpaceList, propNameSpaceList
+
+    def validateSelection(self):
+        """
+        Slot method to check the scene for the selection, showing all the issues found at once.
+
+        Returns:
+            ValidationResult: Result of the validation.
+        """
+        characterNameSpaceList, propNameSpaceList = self.getSelectedNameSpaces()
+
+        validationResult = self.propConstraintValidator.validate(propNameSpaceList, characterNameSpaceList)
+
+        if not validationResult.isValid:
+            PySide2.QtWidgets.QMessageBox.warning(self,
+                                                  self.windowTitle(),
+                                                  validationResult.formatIssues())
+
+        elif self.sender() is self.ValidateButton:
+            PySide2.QtWidgets.QMessageBox.information(self,
+                                                      self.windowTitle(),
+                                                      'No issues found, the constraints can be created.')
+
+        return validationResult
+
     def applyConstraint(self):
         """
         Slot method to apply constraint.
@@ -100,14 +154,17 @@ class PropConstraintMainWindow(PySide2.QtWidgets.QMainWindow):
         if not self.characterSelector.itemsSelectedInList or not self.propSelector.itemsSelectedInList:
             return False
 
-        characterNameSpaceList = ['{0}:'.format(listWidgetItem.text()) for listWidgetItem in
-                              self.characterSelector.itemsSelectedInList]
+        characterNameSpaceList, propNameSpaceList = self.getSelectedNameSpaces()
 
-        propNameSpaceList = ['{0}:'.format(listWidgetItem.text()) for listWidgetItem in
-                         self.propSelector.itemsSelectedInList]
+        # Check the whole selection before the scene is modified.
+        validationResult = self.validateSelection()
+        if not validationResult.isValid:
+            return False
+
+        spaceSwitchPlanList = validationResult.spaceSwitchPlanList
 
-        # Instance of the Core class
-        propConstraint = core.propConstraintCore.PropConstraint()
+        # The scene is modified below, the next apply has to be validated again.
+        self.propConstraintValidator.clearCache()
 
         posesFilePathList = list(self.propPoseSelector.listWidget.getDataFromItemSelected())
 
@@ -127,29 +184,32 @@ class PropConstraintMainWindow(PySide2.QtWidgets.QMainWindow):
             undesiredTranslteAxes = list(self.constraintTypeSelector.translateAxisSelected)
             undesiredRotateAxes = list(self.constraintTypeSelector.rotateAxisSelected)
 
-            core.propConstraintCore.createConstraints(propNameSpaceList,
-                                               characterNameSpaceList,
-                                               selectedMFnConstraint,
-                                               undesiredTranslteAxes,
-                                               undesiredRotateAxes)
+            self.propConstraint.createConstraints(propNameSpaceList,
+                                                  characterNameSpaceList,
+                                                  selectedMFnConstraint,
+                                                  undesiredTranslteAxes,
+                                                  undesiredRotateAxes,
+                                                  spaceSwitchPlanList)
 
         elif selectedMFnConstraint == maya.api.OpenMaya.MFn.kPointConstraint:
             undesiredTranslteAxes = list(self.constraintTypeSelector.translateAxisSelected)
-            core.propConstraintCore.createConstraints(propNameSpaceList,
-                                               characterNameSpaceList,
-                                               selectedMFnConstraint,
-                                               undesiredTranslteAxes,
-                                               None)
+            self.propConstraint.createConstraints(propNameSpaceList,
+                                                  characterNameSpaceList,
+                                                  selectedMFnConstraint,
+                                                  undesiredTranslteAxes,
+                                                  None,
+                                                  spaceSwitchPlanList)
 
 
         else:
             undesiredRotateAxes = list(self.constraintTypeSelector.rotateAxisSelected)
 
-            core.propConstraintCore.createConstraints(propNameSpaceList,
-                                               characterNameSpaceList,
-                                               selectedMFnConstraint,
-                                               None,
-                                               undesiredRotateAxes)
+            self.propConstraint.createConstraints(propNameSpaceList,
+                                                  characterNameSpaceList,
+                                                  selectedMFnConstraint,
+                                                  None,
+                                                  undesiredRotateAxes,
+                                                  spaceSwitchPlanList)
 
 
 class ObjectSelectorWidget(PySide2.QtWidgets.QWidget):